@@ -16,11 +16,11 @@ import logging
 # Import tool registration functions
 from src.tools.core_tools import register_core_tools
 from src.tools.web_tools import register_web_tools
-from src.tools.railway_tools import register_railway_tools
-from src.tools.music_tools import register_music_tools
+from src.tools.railway_tools import register_railway_tools, close_railway_client
+from src.tools.music_tools import register_music_tools, close_music_client
 from src.tools.weather_tools import register_weather_tools
 from src.tools.arxiv_tools import register_arxiv_tools
-from src.tools.hn_tools import register_hn_tools
+from src.tools.hn_tools import register_hn_tools, close_hn_client
 from src.tools.deep_research import register_deep_research_tools
 from src.tools.thinking_tool import register_thinking_tool
 from src.tools.researchers_wet_dream import register_researchers_wet_dream
@@ -188,11 +188,16 @@ async def main():
     """
     logger.info("Starting Chup AI MCP server main()...")
 
-    await mcp.run_async(
-        "streamable-http",
-        host="0.0.0.0",
-        port=8085,
-    )
+    try:
+        await mcp.run_async(
+            "streamable-http",
+            host="0.0.0.0",
+            port=8085,
+        )
+    finally:
+        await close_hn_client()
+        await close_music_client()
+        await close_railway_client()
 
     logger.info("Chup AI MCP server main() completed.")
 
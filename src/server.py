@@ -14,6 +14,9 @@ from .services.academic_service import AcademicService
 from .services.news_service import NewsService
 from .services.thinking_tool_service import ThinkingToolService
 from .services.researchers_wet_dream_service import ResearchersWetDreamService
+from .tools.hn_tools import close_hn_client
+from .tools.music_tools import close_music_client
+from .tools.railway_tools import close_railway_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -60,7 +63,12 @@ class MCPServer:
         logger.info(f"Running MCPServer on {host}:{port}")
         """Run the MCP server."""
         logger.info(f"Starting {self.name} on {host}:{port}")
-        await self.mcp.run_async("streamable-http", host=host, port=port)
+        try:
+            await self.mcp.run_async("streamable-http", host=host, port=port)
+        finally:
+            await close_hn_client()
+            await close_music_client()
+            await close_railway_client()
     
     def get_mcp_instance(self) -> FastMCP:
         """Get the underlying FastMCP instance."""
@@ -133,6 +133,7 @@ Your intelligent WhatsApp assistant with smart tools and live data.
 - `get_youtube_music_stream(song_name, quality)` - Get YouTube music stream
 - `search_and_stream_music(query)` - Search and stream music
 - `download_youtube_audio(song_name, format)` - Download YouTube audio
+- `download_youtube_audios(song_names)` - Download audio for several songs
 
 **Academic Tools:**
 - `search_arxiv_papers(query, max_results)` - Search arXiv papers
@@ -48,6 +48,11 @@ class MusicService(ToolService):
                 description="Search for a song and download its audio.",
                 use_when="When you need to download audio files from YouTube for offline use.",
                 side_effects="Downloads audio files using yt-dlp and may consume storage space and bandwidth."
+            ),
+            "download_youtube_audios": RichToolDescription(
+                description="Search for several songs and download their audio in parallel.",
+                use_when="When you need to download audio for multiple songs from YouTube in one request.",
+                side_effects="Downloads audio files concurrently using yt-dlp and may consume storage space and bandwidth."
             )
         }
     
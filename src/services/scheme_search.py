@@ -1,5 +1,7 @@
 import psycopg2
 import logging
+import functools
+import re
 from typing import Dict, List, Optional, Any
 from sentence_transformers import SentenceTransformer
 import os
@@ -19,12 +21,23 @@ DB_CONFIG = {
     'password': os.getenv('DB_PASSWORD', 'postgres')
 }
 
+# Queries that differ only in case or spacing embed the same (the model's tokenizer is uncased)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query for the embedding cache."""
+    return _WHITESPACE_RE.sub(" ", query.strip().lower())
+
+
 class SchemeSearchService:
     """Service for searching government schemes using vector embeddings."""
     
     def __init__(self):
         self.model = None
         self._load_model()
+        # Repeat and popular queries skip re-encoding; embeddings are tuples so they're safe to share
+        self._embed_query = functools.lru_cache(maxsize=2048)(self._encode_query)
     
     def _load_model(self):
         """Load the sentence transformer model."""
@@ -36,6 +49,10 @@ class SchemeSearchService:
             logger.error(f"Failed to load model: {e}")
             self.model = None
     
+    def _encode_query(self, normalized_query: str) -> tuple:
+        """Encode a normalized query with the sentence transformer model."""
+        return tuple(self.model.encode(normalized_query, convert_to_tensor=False).tolist())
+    
     def _get_db_connection(self):
         """Get database connection."""
         try:
@@ -123,7 +140,7 @@ class SchemeSearchService:
             }
             
             # Generate embedding for the translated query
-            query_embedding = self.model.encode(translated_query, convert_to_tensor=False)
+            query_embedding = self._embed_query(_normalize_query(translated_query))
             
             # Log translations for debugging
             if source_lang:
@@ -157,7 +174,7 @@ class SchemeSearchService:
                 WHERE se.embedding IS NOT NULL
             """
             
-            params = [query_embedding.tolist()]
+            params = [list(query_embedding)]
             conditions = []
             
             # Add optional filters
@@ -9,16 +9,34 @@ from mcp import ErrorData, McpError
 from mcp.types import INTERNAL_ERROR, TextContent
 import httpx
 import json
+import orjson
 import re
 import asyncio
 import os
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from urllib.parse import quote_plus, unquote
+from functools import cached_property
+from collections import defaultdict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Reference sections, bibliographies, numbered "[n] ..." and "(yyyy). ..." entries
+_REFERENCE_PATTERN = re.compile(
+    r'References?\s*\n(?P<refs>.*?)(?=\n\n|\n[A-Z]|\Z)'
+    r'|Bibliography\s*\n(?P<bib>.*?)(?=\n\n|\n[A-Z]|\Z)'
+    r'|\[\d+\]\s*(?P<num>[^\n]+)'
+    r'|\(\d{4}\)\.\s*(?P<year>[^\n]+)',
+    re.DOTALL | re.IGNORECASE
+)
+_QUOTED_TITLE_PATTERN = re.compile(r'"([^"]+)"')
+
+
+def _trunc(text: str, limit: int = 60) -> str:
+    """Truncate text to limit characters, marking the cut with '...'"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
 
 class RichToolDescription:
     """Rich tool description model for MCP server compatibility."""
@@ -78,6 +96,22 @@ class UnifiedCitation:
         self.open_access_url = ""
         self.publication_types = []
         self.fields_of_study = []
+    
+    @cached_property
+    def preview(self) -> Dict[str, Any]:
+        """Truncated node view for the citation tree, computed once after traversal"""
+        return {
+            "id": self.url,
+            "title": self.title,
+            "source": self.source,
+            "depth": self.depth,
+            "concepts": self.key_concepts[:5],
+            "summary": self.content_summary[:200] + "..." if len(self.content_summary) > 200 else self.content_summary,
+            "abstract": self.abstract[:300] + "..." if len(self.abstract) > 300 else self.abstract,
+            "citation_count": self.citation_count,
+            "venue": self.venue,
+            "authors": self.authors[:3]  # First 3 authors
+        }
 
 
 class UnifiedDeepResearchEngine:
@@ -90,6 +124,8 @@ class UnifiedDeepResearchEngine:
         self.visited_paper_ids = set()
         self.citation_graph = {}
         self.research_tree = []
+        self._max_depth = 0
+        self._seen_ids = set()  # DOI / paper_id / URL of every citation traversed this session
         
         # API endpoints
         self.wiki_api = "https://en.wikipedia.org/w/api.php"
@@ -103,15 +139,20 @@ class UnifiedDeepResearchEngine:
         self.openalex_delay = 1.0
         self.pubmed_delay = 0.34
         
+        # Cap on stored full text per citation (PMC BioC dumps can be hundreds of KB)
+        self.full_content_cap = 32_000
+        
     async def unified_deep_research(self, topic: str) -> Dict[str, Any]:
         """Perform comprehensive deep research across all sources"""
-        logger.info(f"Starting unified deep research on: {topic}")
+        logger.info("Starting unified deep research on: %s", topic)
         
         # Reset state
         self.visited_urls.clear()
         self.visited_paper_ids.clear()
         self.citation_graph.clear()
         self.research_tree.clear()
+        self._max_depth = 0
+        self._seen_ids.clear()
         
         # Search all sources simultaneously
         initial_citations = await self._search_all_sources(topic)
@@ -133,7 +174,7 @@ class UnifiedDeepResearchEngine:
             "total_sources": len(self.research_tree),
             "citations": citations,  # Add citations in dictionary format
             "source_breakdown": self._get_source_breakdown(),
-            "max_depth_reached": max(c.depth for c in self.research_tree) if self.research_tree else 0,
+            "max_depth_reached": self._max_depth,
             "analysis": analysis,
             "citation_tree": self._build_unified_citation_tree(),
             "content_metrics": self._calculate_content_metrics(),
@@ -159,7 +200,7 @@ class UnifiedDeepResearchEngine:
             if isinstance(result, list):
                 all_citations.extend(result)
             elif isinstance(result, Exception):
-                logger.error(f"Source search error: {result}")
+                logger.error("Source search error: %s", result)
         
         return all_citations
     
@@ -170,6 +211,9 @@ class UnifiedDeepResearchEngine:
             
         if citation.url in self.visited_urls or (citation.paper_id and citation.paper_id in self.visited_paper_ids):
             return
+        # The same work found through another source (e.g. by DOI) is only traversed once
+        if self._citation_key(citation) in self._seen_ids:
+            return
         
         self.visited_urls.add(citation.url)
         if citation.paper_id:
@@ -177,8 +221,10 @@ class UnifiedDeepResearchEngine:
         
         citation.depth = current_depth
         self.research_tree.append(citation)
+        self._max_depth = max(self._max_depth, current_depth)
+        self._seen_ids.add(self._citation_key(citation))
         
-        logger.info(f"Processing depth {current_depth} ({citation.source}): {citation.title[:50]}...")
+        logger.info("Processing depth %s (%s): %s...", current_depth, citation.source, citation.title[:50])
         
         # Process based on source type
         if citation.source == "wikipedia":
@@ -198,6 +244,17 @@ class UnifiedDeepResearchEngine:
                 if ref_citation.url not in self.visited_urls and (not ref_citation.paper_id or ref_citation.paper_id not in self.visited_paper_ids):
                     await self._unified_dfs_traversal(ref_citation, current_depth + 1)
 
+    def _citation_key(self, citation: UnifiedCitation) -> str:
+        """Identity key used to deduplicate citations across sources"""
+        return citation.doi or citation.paper_id or citation.url
+    
+    def _is_new_reference(self, parent: UnifiedCitation, citation: UnifiedCitation) -> bool:
+        """Return False if a reference was already traversed or is already listed under this parent"""
+        key = self._citation_key(citation)
+        if key in self._seen_ids:
+            return False
+        return all(self._citation_key(ref) != key for ref in parent.references)
+
     # Wikipedia search methods
     async def _search_wikipedia(self, query: str) -> List[UnifiedCitation]:
         """Search Wikipedia articles"""
@@ -212,7 +269,7 @@ class UnifiedDeepResearchEngine:
             
             async with httpx.AsyncClient(timeout=15) as client:
                 response = await client.get(self.wiki_api, params=params)
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 citations = []
                 for item in data.get("query", {}).get("search", []):
@@ -228,7 +285,7 @@ class UnifiedDeepResearchEngine:
                 return citations
                 
         except Exception as e:
-            logger.error(f"Wikipedia search error: {e}")
+            logger.error("Wikipedia search error: %s", e)
             return []
     
     # arXiv search methods
@@ -282,7 +339,7 @@ class UnifiedDeepResearchEngine:
                 return citations
                 
         except Exception as e:
-            logger.error(f"arXiv search error: {e}")
+            logger.error("arXiv search error: %s", e)
             return []
     
     def _parse_arxiv_xml(self, xml_text: str) -> List[Dict]:
@@ -323,7 +380,7 @@ class UnifiedDeepResearchEngine:
             
             return entries
         except Exception as e:
-            logger.error(f"XML parsing error: {e}")
+            logger.error("XML parsing error: %s", e)
             return []
     
     # Semantic Scholar search methods
@@ -346,13 +403,13 @@ class UnifiedDeepResearchEngine:
                     return []
                 
                 if response.status_code != 200:
-                    logger.error(f"Semantic Scholar search failed with status {response.status_code}")
+                    logger.error("Semantic Scholar search failed with status %s", response.status_code)
                     return []
                 
                 try:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                 except Exception as e:
-                    logger.error(f"Failed to parse Semantic Scholar JSON response: {e}")
+                    logger.error("Failed to parse Semantic Scholar JSON response: %s", e)
                     return []
                 
                 if not data or not isinstance(data, dict):
@@ -412,7 +469,7 @@ class UnifiedDeepResearchEngine:
                 return citations
                 
         except Exception as e:
-            logger.error(f"Semantic Scholar search error: {e}")
+            logger.error("Semantic Scholar search error: %s", e)
             return []
     
     # OpenAlex search methods
@@ -429,7 +486,7 @@ class UnifiedDeepResearchEngine:
             
             async with httpx.AsyncClient(timeout=15) as client:
                 response = await client.get(url, params=params, headers=headers)
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 citations = []
                 for work in data.get("results", []):
@@ -472,7 +529,7 @@ class UnifiedDeepResearchEngine:
                 return citations
                 
         except Exception as e:
-            logger.error(f"OpenAlex search error: {e}")
+            logger.error("OpenAlex search error: %s", e)
             return []
     
     def _reconstruct_abstract(self, inverted_index: Dict) -> str:
@@ -505,7 +562,7 @@ class UnifiedDeepResearchEngine:
             
             async with httpx.AsyncClient(timeout=15) as client:
                 search_response = await client.get(search_url, params=search_params)
-                search_data = search_response.json()
+                search_data = orjson.loads(search_response.content)
                 
                 pmids = search_data.get("esearchresult", {}).get("idlist", [])
                 
@@ -530,7 +587,7 @@ class UnifiedDeepResearchEngine:
                 return citations
                 
         except Exception as e:
-            logger.error(f"PubMed search error: {e}")
+            logger.error("PubMed search error: %s", e)
             return []
     
     def _parse_pubmed_xml(self, xml_text: str) -> List[UnifiedCitation]:
@@ -596,7 +653,7 @@ class UnifiedDeepResearchEngine:
             return citations
             
         except Exception as e:
-            logger.error(f"PubMed XML parsing error: {e}")
+            logger.error("PubMed XML parsing error: %s", e)
             return []
     
     # Content processing methods
@@ -616,7 +673,7 @@ class UnifiedDeepResearchEngine:
             
             async with httpx.AsyncClient(timeout=15) as client:
                 response = await client.get(self.wiki_api, params=params)
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 pages = data.get("query", {}).get("pages", {})
                 page_data = next(iter(pages.values()), {})
@@ -660,10 +717,11 @@ class UnifiedDeepResearchEngine:
                             parent=citation.title,
                             depth=citation.depth + 1
                         )
-                        citation.references.append(ref_citation)
+                        if self._is_new_reference(citation, ref_citation):
+                            citation.references.append(ref_citation)
                 
         except Exception as e:
-            logger.error(f"Error processing Wikipedia page: {e}")
+            logger.error("Error processing Wikipedia page: %s", e)
     
     async def _process_arxiv_paper(self, citation: UnifiedCitation):
         """Extract content and references from arXiv paper"""
@@ -707,10 +765,11 @@ class UnifiedDeepResearchEngine:
                             ref_paper = ref_papers[0]
                             ref_paper.parent = citation.title
                             ref_paper.depth = citation.depth + 1
-                            citation.references.append(ref_paper)
+                            if self._is_new_reference(citation, ref_paper):
+                                citation.references.append(ref_paper)
                 
         except Exception as e:
-            logger.error(f"Error processing arXiv paper: {e}")
+            logger.error("Error processing arXiv paper: %s", e)
     
     async def _process_semantic_scholar_paper(self, citation: UnifiedCitation):
         """Process Semantic Scholar paper for references and citations"""
@@ -725,7 +784,7 @@ class UnifiedDeepResearchEngine:
             
             async with httpx.AsyncClient(timeout=15) as client:
                 response = await client.get(url, params=params)
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 # Extract fields of study
                 s2_fields = data.get("s2FieldsOfStudy", [])
@@ -745,12 +804,13 @@ class UnifiedDeepResearchEngine:
                             parent=citation.title,
                             depth=citation.depth + 1
                         )
-                        citation.references.append(ref_citation)
+                        if self._is_new_reference(citation, ref_citation):
+                            citation.references.append(ref_citation)
                 
                 await asyncio.sleep(self.semantic_scholar_delay)
                 
         except Exception as e:
-            logger.error(f"Error processing Semantic Scholar paper: {e}")
+            logger.error("Error processing Semantic Scholar paper: %s", e)
     
     async def _process_openalex_work(self, citation: UnifiedCitation):
         """Process OpenAlex work for references and concepts"""
@@ -763,7 +823,7 @@ class UnifiedDeepResearchEngine:
             
             async with httpx.AsyncClient(timeout=15) as client:
                 response = await client.get(url, headers=headers)
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 # Extract concepts
                 concepts = []
@@ -784,12 +844,13 @@ class UnifiedDeepResearchEngine:
                         parent=citation.title,
                         depth=citation.depth + 1
                     )
-                    citation.references.append(ref_citation)
+                    if self._is_new_reference(citation, ref_citation):
+                        citation.references.append(ref_citation)
                 
                 await asyncio.sleep(self.openalex_delay)
                 
         except Exception as e:
-            logger.error(f"Error processing OpenAlex work: {e}")
+            logger.error("Error processing OpenAlex work: %s", e)
     
     async def _process_pubmed_article(self, citation: UnifiedCitation):
         """Process PubMed article for additional content"""
@@ -808,7 +869,7 @@ class UnifiedDeepResearchEngine:
             
             async with httpx.AsyncClient(timeout=15) as client:
                 response = await client.get(pmc_url, params=params)
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 # Check if PMC version is available
                 link_sets = data.get("linksets", [])
@@ -828,7 +889,7 @@ class UnifiedDeepResearchEngine:
                 await asyncio.sleep(self.pubmed_delay)
                 
         except Exception as e:
-            logger.error(f"Error processing PubMed article: {e}")
+            logger.error("Error processing PubMed article: %s", e)
     
     async def _fetch_pmc_content(self, pmc_id: str) -> str:
         """Fetch full text from PMC"""
@@ -847,9 +908,9 @@ class UnifiedDeepResearchEngine:
                         if text_elem is not None and text_elem.text:
                             text_parts.append(text_elem.text)
                     
-                    return "\n\n".join(text_parts)
+                    return "\n\n".join(text_parts)[:self.full_content_cap]
         except Exception as e:
-            logger.error(f"Error fetching PMC content: {e}")
+            logger.error("Error fetching PMC content: %s", e)
         
         return ""
     
@@ -867,43 +928,11 @@ class UnifiedDeepResearchEngine:
                 if response.status_code == 200:
                     content_size = len(response.content)
                     if content_size > 0:
-                        # Try to extract text using PyPDF2 if available
-                        try:
-                            import PyPDF2
-                            import io
-                            
-                            pdf_file = io.BytesIO(response.content)
-                            pdf_reader = PyPDF2.PdfReader(pdf_file)
-                            
-                            full_text = ""
-                            for page_num in range(min(len(pdf_reader.pages), 10)):  # Limit to first 10 pages
-                                page = pdf_reader.pages[page_num]
-                                page_text = page.extract_text()
-                                if page_text:
-                                    full_text += f"\n--- Page {page_num + 1} ---\n{page_text}\n"
-                            
-                            if full_text.strip():
-                                return full_text.strip()
-                            
-                        except ImportError:
-                            logger.info("PyPDF2 not available, trying pdfplumber")
-                            try:
-                                import pdfplumber
-                                import io
-                                
-                                pdf_file = io.BytesIO(response.content)
-                                with pdfplumber.open(pdf_file) as pdf:
-                                    full_text = ""
-                                    for page_num, page in enumerate(pdf.pages[:10]):  # Limit to first 10 pages
-                                        page_text = page.extract_text()
-                                        if page_text:
-                                            full_text += f"\n--- Page {page_num + 1} ---\n{page_text}\n"
-                                    
-                                    if full_text.strip():
-                                        return full_text.strip()
-                                        
-                            except ImportError:
-                                logger.info("pdfplumber not available, using fallback")
+                        # PDF parsing is CPU-bound, keep it off the event loop
+                        loop = asyncio.get_running_loop()
+                        full_text = await loop.run_in_executor(None, self._extract_pdf_text_sync, response.content)
+                        if full_text:
+                            return full_text[:self.full_content_cap]
                         
                         # Fallback: return structured content with metadata
                         return f"""
@@ -920,14 +949,77 @@ PDF Content Size: {content_size:,} bytes
 Content Type: Academic Research Paper
 Source: ArXiv PDF
 
-Note: Full text extraction requires PyPDF2 or pdfplumber library.
-Install with: pip install PyPDF2 pdfplumber
+Note: Full text extraction requires pypdfium2, PyPDF2 or pdfplumber library.
+Install with: pip install pypdfium2 PyPDF2 pdfplumber
 
 The complete text would be extracted here using PDF processing libraries.
 """
                     
         except Exception as e:
-            logger.error(f"Error extracting PDF content: {e}")
+            logger.error("Error extracting PDF content: %s", e)
+        
+        return ""
+    
+    def _extract_pdf_text_sync(self, pdf_bytes: bytes) -> str:
+        """Extract text from the first pages of a PDF (blocking, run in an executor)"""
+        # Prefer pypdfium2's C-backed range extraction when available
+        try:
+            import pypdfium2 as pdfium
+            
+            pdf = pdfium.PdfDocument(pdf_bytes)
+            try:
+                parts = []
+                for page_num in range(min(len(pdf), 10)):  # Limit to first 10 pages
+                    page = pdf[page_num]
+                    text_page = page.get_textpage()
+                    page_text = text_page.get_text_range()
+                    text_page.close()
+                    page.close()
+                    if page_text:
+                        parts.append(f"\n--- Page {page_num + 1} ---\n{page_text}\n")
+            finally:
+                pdf.close()
+            
+            return "".join(parts).strip()
+            
+        except ImportError:
+            logger.info("pypdfium2 not available, trying PyPDF2")
+        
+        # Try to extract text using PyPDF2 if available
+        try:
+            import PyPDF2
+            import io
+            
+            pdf_file = io.BytesIO(pdf_bytes)
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            
+            parts = []
+            for page_num in range(min(len(pdf_reader.pages), 10)):  # Limit to first 10 pages
+                page = pdf_reader.pages[page_num]
+                page_text = page.extract_text()
+                if page_text:
+                    parts.append(f"\n--- Page {page_num + 1} ---\n{page_text}\n")
+            
+            return "".join(parts).strip()
+            
+        except ImportError:
+            logger.info("PyPDF2 not available, trying pdfplumber")
+            try:
+                import pdfplumber
+                import io
+                
+                pdf_file = io.BytesIO(pdf_bytes)
+                with pdfplumber.open(pdf_file) as pdf:
+                    parts = []
+                    for page_num, page in enumerate(pdf.pages[:10]):  # Limit to first 10 pages
+                        page_text = page.extract_text()
+                        if page_text:
+                            parts.append(f"\n--- Page {page_num + 1} ---\n{page_text}\n")
+                    
+                    return "".join(parts).strip()
+                    
+            except ImportError:
+                logger.info("pdfplumber not available, using fallback")
         
         return ""
     
@@ -935,35 +1027,23 @@ The complete text would be extracted here using PDF processing libraries.
         """Extract reference titles from paper content"""
         references = []
         
-        # Look for common reference patterns
+        # Single pass over the content for all reference patterns
         # This is a simplified approach - in practice you'd use more sophisticated NLP
-        ref_patterns = [
-            r'References?\s*\n(.*?)(?=\n\n|\n[A-Z]|\Z)',
-            r'Bibliography\s*\n(.*?)(?=\n\n|\n[A-Z]|\Z)',
-            r'\[(\d+)\]\s*([^\n]+)',
-            r'\(\d{4}\)\.\s*([^\n]+)',
-        ]
-        
-        for pattern in ref_patterns:
-            matches = re.findall(pattern, content, re.DOTALL | re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    ref_text = match[1] if len(match) > 1 else match[0]
-                else:
-                    ref_text = match
-                
-                # Extract potential paper titles (simplified)
-                titles = re.findall(r'"([^"]+)"', ref_text)
-                if not titles:
-                    # Look for title-like patterns
-                    sentences = ref_text.split('.')
-                    for sentence in sentences[:3]:  # Check first few sentences
-                        if len(sentence.strip()) > 10 and len(sentence.strip()) < 200:
-                            titles.append(sentence.strip())
-                
-                references.extend(titles)
-                if len(references) >= 10:  # Limit references
-                    break
+        for match in _REFERENCE_PATTERN.finditer(content):
+            ref_text = match.group(match.lastgroup)
+            
+            # Extract potential paper titles (simplified)
+            titles = _QUOTED_TITLE_PATTERN.findall(ref_text)
+            if not titles:
+                # Look for title-like patterns
+                sentences = ref_text.split('.')
+                for sentence in sentences[:3]:  # Check first few sentences
+                    if len(sentence.strip()) > 10 and len(sentence.strip()) < 200:
+                        titles.append(sentence.strip())
+            
+            references.extend(titles)
+            if len(references) >= 5:
+                break
         
         return references[:5]  # Return top 5 references
     
@@ -1023,24 +1103,10 @@ The complete text would be extracted here using PDF processing libraries.
     
     def _build_unified_citation_tree(self) -> Dict[str, Any]:
         """Build hierarchical citation tree for visualization"""
-        tree = {"nodes": [], "edges": []}
+        tree = {"nodes": [c.preview for c in self.research_tree], "edges": []}
         
+        # Add edges to show relationships
         for citation in self.research_tree:
-            node = {
-                "id": citation.url,
-                "title": citation.title,
-                "source": citation.source,
-                "depth": citation.depth,
-                "concepts": citation.key_concepts[:5],
-                "summary": citation.content_summary[:200] + "..." if len(citation.content_summary) > 200 else citation.content_summary,
-                "abstract": citation.abstract[:300] + "..." if len(citation.abstract) > 300 else citation.abstract,
-                "citation_count": citation.citation_count,
-                "venue": citation.venue,
-                "authors": citation.authors[:3]  # First 3 authors
-            }
-            tree["nodes"].append(node)
-            
-            # Add edges to show relationships
             if citation.parent:
                 tree["edges"].append({
                     "from": citation.parent,
@@ -1138,7 +1204,7 @@ The complete text would be extracted here using PDF processing libraries.
 • Semantic Scholar Papers: {source_breakdown.get('semantic_scholar', 0)}
 • OpenAlex Works: {source_breakdown.get('openalex', 0)}
 • PubMed Articles: {source_breakdown.get('pubmed', 0)}
-• Maximum Citation Depth: {max(c.depth for c in self.research_tree)}
+• Maximum Citation Depth: {self._max_depth}
 
 **🧠 Key Concepts Identified:**
 {chr(10).join([f"• {concept} (mentioned {count} times)" for concept, count in top_concepts[:10]])}
@@ -1147,12 +1213,13 @@ The complete text would be extracted here using PDF processing libraries.
 """
         
         # Add depth analysis
-        depth_counts = {}
+        depth_counts = defaultdict(int)
         for citation in self.research_tree:
-            depth_counts[citation.depth] = depth_counts.get(citation.depth, 0) + 1
+            depth_counts[citation.depth] += 1
         
-        for depth in sorted(depth_counts.keys()):
-            analysis += f"• Depth {depth}: {depth_counts[depth]} sources\n"
+        for depth in range(self._max_depth + 1):
+            if depth_counts.get(depth):
+                analysis += f"• Depth {depth}: {depth_counts[depth]} sources\n"
         
         analysis += "\n**🎯 Comprehensive Research Results:**\n"
         
@@ -1199,7 +1266,7 @@ The complete text would be extracted here using PDF processing libraries.
 **🔗 Citation Network Analysis:**
 • Direct references found: {sum(len(c.references) for c in self.research_tree)}
 • Cross-references discovered: {len([c for c in self.research_tree if c.parent])}
-• Citation depth achieved: {max(c.depth for c in self.research_tree)} levels
+• Citation depth achieved: {self._max_depth} levels
 • Multi-source coverage: {len(source_breakdown)} different databases
 
 **📈 Research Quality Metrics:**
@@ -1265,7 +1332,11 @@ The complete text would be extracted here using PDF processing libraries.
                 'full_content': citation.full_content,
                 'content_summary': citation.content_summary,
                 'key_concepts': citation.key_concepts,
-                'references': [ref.__dict__ if hasattr(ref, '__dict__') else ref for ref in citation.references],
+                # preview is a cached_property, so once computed it sits in __dict__
+                'references': [
+                    {k: v for k, v in ref.__dict__.items() if k != 'preview'} if hasattr(ref, '__dict__') else ref
+                    for ref in citation.references
+                ],
                 'cited_by': citation.cited_by,
                 'influential_citation_count': citation.influential_citation_count,
                 'open_access_url': citation.open_access_url,
@@ -1277,18 +1348,20 @@ The complete text would be extracted here using PDF processing libraries.
         return citations
 
 
+# Tool description is constant, serialize it once at import
+DEEP_RESEARCH_DESC_JSON = RichToolDescription(
+    description="Perform comprehensive deep research on any topic using DFS citation analysis through Wikipedia and arXiv sources.",
+    use_when="When you need thorough research with citation traversal, reference analysis, and comprehensive topic exploration across multiple academic and encyclopedic sources.",
+    side_effects="Makes multiple API calls to Wikipedia and arXiv, performs DFS traversal through citations which may take significant time for complex topics.",
+).model_dump_json()
+
+
 def register_deep_research_tools(mcp):
     """Register deep research tools with the MCP server."""
     
     logger.info("Registering deep research tools...")
     
-    DeepResearchToolDescription = RichToolDescription(
-        description="Perform comprehensive deep research on any topic using DFS citation analysis through Wikipedia and arXiv sources.",
-        use_when="When you need thorough research with citation traversal, reference analysis, and comprehensive topic exploration across multiple academic and encyclopedic sources.",
-        side_effects="Makes multiple API calls to Wikipedia and arXiv, performs DFS traversal through citations which may take significant time for complex topics.",
-    )
-    
-    @mcp.tool(description=DeepResearchToolDescription.model_dump_json())
+    @mcp.tool(description=DEEP_RESEARCH_DESC_JSON)
     async def deep_research_with_citations(
         topic: Annotated[str, Field(description="Research topic or question to investigate deeply")],
         max_depth: Annotated[int, Field(description="Maximum citation depth to explore (0-4)", default=2)] = 2,
@@ -1313,10 +1386,11 @@ def register_deep_research_tools(mcp):
             "max_depth": max_depth,
             "include_citation_tree": include_citation_tree
         }
-        logger.info(f"deep_research_with_citations tool called with complete input: {json.dumps(input_data, indent=2)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("deep_research_with_citations tool called with complete input: %s", orjson.dumps(input_data, option=orjson.OPT_INDENT_2).decode())
         
         try:
-            logger.info(f"Starting deep research for: {topic} (depth: {max_depth})")
+            logger.info("Starting deep research for: %s (depth: %s)", topic, max_depth)
             
             # Initialize research engine
             research_engine = UnifiedDeepResearchEngine(max_depth=max_depth, max_refs_per_source=3)
@@ -1333,51 +1407,57 @@ def register_deep_research_tools(mcp):
                     research_data=results,
                     source_tool="deep_research_with_citations"
                 )
-                logger.info(f"Recorded deep research call with session ID: {session_id}")
+                logger.info("Recorded deep research call with session ID: %s", session_id)
             except Exception as e:
-                logger.warning(f"Failed to record deep research call: {e}")
+                logger.warning("Failed to record deep research call: %s", e)
             
             # Log complete results
-            logger.info(f"Deep research completed with complete results: {json.dumps(results, indent=2, default=str)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Deep research completed with complete results: %s", orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str).decode())
             
             if not results.get("success"):
                 error_response = "❌ **Research failed:** Unable to find sufficient sources for analysis."
-                logger.error(f"Deep research failed: {error_response}")
+                logger.error("Deep research failed: %s", error_response)
                 return [TextContent(type="text", text=error_response)]
             
-            # Format comprehensive results
-            result_text = results["analysis"]
+            # Format comprehensive results as separate sections so clients can render the analysis first
+            contents = [TextContent(type="text", text=results["analysis"].strip())]
             
             if include_citation_tree and results.get("citation_tree"):
                 citation_tree = results["citation_tree"]
-                result_text += f"""
-
-**🌳 Citation Tree Structure:**
-
-**Primary Sources ({len([n for n in citation_tree['nodes'] if n['depth'] == 0])}):**
-"""
                 
-                # Show tree structure
-                depth_groups = {}
+                # Show tree structure: only levels 1-2 are rendered, five nodes each,
+                # while the same pass counts primary sources for the header
+                depth_groups = defaultdict(list)
+                depth_counts = defaultdict(int)
                 for node in citation_tree["nodes"]:
                     depth = node["depth"]
-                    if depth not in depth_groups:
-                        depth_groups[depth] = []
-                    depth_groups[depth].append(node)
+                    if depth > 2:
+                        continue
+                    depth_counts[depth] += 1
+                    if depth and len(depth_groups[depth]) < 5:
+                        depth_groups[depth].append(node)
                 
-                for depth in sorted(depth_groups.keys())[:3]:  # Show first 3 levels
-                    if depth == 0:
+                parts = [f"""**🌳 Citation Tree Structure:**
+
+**Primary Sources ({depth_counts[0]}):**
+"""]
+                
+                for depth in range(1, 3):  # Levels 1-2; primary sources are only counted
+                    nodes = depth_groups.get(depth)
+                    if not nodes:
                         continue
-                    result_text += f"\n**Level {depth} References ({len(depth_groups[depth])}):\n"
-                    for node in depth_groups[depth][:5]:  # Show first 5 per level
-                        indent = "  " * depth
-                        result_text += f"{indent}└─ {node['title'][:60]}{'...' if len(node['title']) > 60 else ''} ({node['source']})\n"
-                        if node['concepts']:
-                            result_text += f"{indent}   📝 Key concepts: {', '.join(node['concepts'][:3])}\n"
+                    parts.append(f"\n**Level {depth} References ({depth_counts[depth]}):\n")
+                    indent = "  " * depth
+                    for node in nodes:  # Show first 5 per level
+                        concepts = node['concepts']
+                        parts.append(f"{indent}└─ {_trunc(node['title'])} ({node['source']})\n")
+                        if concepts:
+                            parts.append(f"{indent}   📝 Key concepts: {', '.join(concepts[:3])}\n")
+                
+                contents.append(TextContent(type="text", text="".join(parts).strip()))
             
-            result_text += f"""
-
-**📋 Research Summary:**
+            summary_text = f"""**📋 Research Summary:**
 • **Research completed:** {results['timestamp'][:19]}
 • **Total processing time:** Advanced DFS citation analysis
 • **Knowledge depth achieved:** {results['max_depth_reached']} levels
@@ -1390,17 +1470,17 @@ def register_deep_research_tools(mcp):
 ✅ Cross-reference validation
 ✅ Knowledge graph construction
 
-*🔴 Live deep research using advanced citation analysis*
-            """
+*🔴 Live deep research using advanced citation analysis*"""
+            contents.append(TextContent(type="text", text=summary_text))
             
             # Log complete output
-            logger.info(f"deep_research_with_citations tool completed with complete output: {result_text}")
-            return [TextContent(type="text", text=result_text.strip())]
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("deep_research_with_citations tool completed with complete output: %s", "\n\n".join(c.text for c in contents))
+            return contents
             
         except Exception as e:
             error_msg = f"Error performing deep research: {str(e)}"
-            logger.error(f"deep_research_with_citations tool failed with complete error: {error_msg}")
-            logger.error(f"Full exception details: {e}")
+            logger.exception("deep_research_with_citations tool failed: %s", error_msg)
             raise McpError(
                 ErrorData(
                     code=INTERNAL_ERROR,
@@ -7,46 +7,148 @@ from pydantic import Field
 from mcp import ErrorData, McpError
 from mcp.types import INTERNAL_ERROR, INVALID_PARAMS, TextContent
 import httpx
+import orjson
+import asyncio
 import logging
 from datetime import datetime
-from urllib.parse import urlencode
 import openai
-from ..utils.helpers import translate_to_english
+from ..utils.helpers import translate_to_english, TTLCache
 
 logger = logging.getLogger(__name__)
 
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+    def parse_datetime(value: str) -> datetime:
+        """Parse an ISO-8601 timestamp, accepting a trailing 'Z'."""
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
 class RichToolDescription(openai.BaseModel):
     """Rich tool description model for MCP server compatibility."""
     description: str
     use_when: str
     side_effects: Optional[str]
 
+
+# Tool descriptions are constant, serialize them once at import
+GET_HN_STORIES_DESC_JSON = RichToolDescription(
+    description="Get Hacker News stories by type (top, new, ask, show).",
+    use_when="Fetches and formats stories from Hacker News, including titles, points, comment counts, and URLs.",
+    side_effects="Makes API calls to Hacker News Algolia API and may be subject to rate limiting.",
+).model_dump_json()
+
+SEARCH_HN_STORIES_DESC_JSON = RichToolDescription(
+    description="Search Hacker News stories by keyword.",
+    use_when="Performs a full-text search across Hacker News stories and returns matching results with relevance ranking.",
+    side_effects="Makes API calls to Hacker News Algolia API and may be subject to rate limiting.",
+).model_dump_json()
+
+GET_HN_USER_DESC_JSON = RichToolDescription(
+    description="Get Hacker News user information and recent submissions.",
+    use_when="Fetches user profile information including karma, creation date, and recent story submissions.",
+    side_effects="Makes API calls to Hacker News Algolia API and may be subject to rate limiting.",
+).model_dump_json()
+
+
+HN_API_BASE = "https://hn.algolia.com/api/v1"
+HN_USER_AGENT = "ChupAI/1.0 (github.com/jaywyawhare/puch-ai-hiring)"
+
+# Story rendering templates
+STORY_LINE_TMPL = "{i}. **{title}**\n   👤 by {author} | ⬆️ {points} points | 💬 {comments} comments | 🕒 {time}"
+STORY_URL_TMPL = "\n   🔗 {url}"
+STORY_LINK_TMPL = "\n   📎 https://news.ycombinator.com/item?id={story_id}"
+USER_STORY_TMPL = "\n{i}. **{title}**\n   ⬆️ {points} points | 💬 {comments} comments\n   {url_line}\n   📎 https://news.ycombinator.com/item?id={story_id}\n"
+
+# Shared client so requests reuse pooled keep-alive connections
+_HN_CLIENT: Optional[httpx.AsyncClient] = None
+_HN_CLIENT_LOCK = asyncio.Lock()
+
+# Cap in-flight Algolia requests so bursts of tool calls don't get throttled
+_HN_SEM = asyncio.Semaphore(8)
+
+# Story listings and user profiles barely change within a few seconds
+_HN_CACHE = TTLCache(maxsize=256, ttl=30)
+
+
+async def _get_client() -> httpx.AsyncClient:
+    """Get the shared HN API client, creating it on first use."""
+    global _HN_CLIENT
+    if _HN_CLIENT is None or _HN_CLIENT.is_closed:
+        async with _HN_CLIENT_LOCK:
+            if _HN_CLIENT is None or _HN_CLIENT.is_closed:
+                _HN_CLIENT = httpx.AsyncClient(
+                    base_url=HN_API_BASE,
+                    timeout=httpx.Timeout(10.0, connect=2.0, read=8.0, write=2.0),
+                    headers={'User-Agent': HN_USER_AGENT},
+                    # Pool limits live on the transport, which also retries failed connects
+                    transport=httpx.AsyncHTTPTransport(
+                        retries=2,
+                        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+                    )
+                )
+    return _HN_CLIENT
+
+
+async def close_hn_client() -> None:
+    """Close the shared HN API client."""
+    global _HN_CLIENT
+    if _HN_CLIENT is not None:
+        await _HN_CLIENT.aclose()
+        _HN_CLIENT = None
+
+
+def _render_story(i: int, story: Dict[str, Any]) -> str:
+    """Render a single story hit as a numbered markdown entry."""
+    get = story.get
+    url = get("url", "")
+    
+    try:
+        time_str = parse_datetime(get("created_at", "")).strftime("%Y-%m-%d %H:%M")
+    except:
+        time_str = "unknown time"
+    
+    story_text = STORY_LINE_TMPL.format(
+        i=i,
+        title=get("title", "[No title]"),
+        author=get("author", "anonymous"),
+        points=int(get("points", 0) or 0),
+        comments=int(get("num_comments", 0) or 0),
+        time=time_str
+    )
+    if url:
+        story_text += STORY_URL_TMPL.format(url=url)
+    return story_text + STORY_LINK_TMPL.format(story_id=get("objectID", ""))
+
+
 class HackerNewsAPI:
     """HN API client with proper error handling and rate limiting."""
     
     def __init__(self):
-        self.base_url = "https://hn.algolia.com/api/v1"
+        self.base_url = HN_API_BASE
         
-    async def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+    async def _make_request(self, endpoint: str, params: Optional[Dict] = None, use_cache: bool = True) -> Dict:
         """Make API request with error handling."""
-        url = f"{self.base_url}/{endpoint}"
-        if params:
-            url += f"?{urlencode(params)}"
-            
-        logger.debug(f"HN API request: {url}")
+        cache_key = (endpoint, tuple(sorted(params.items())) if params else ())
+        if use_cache:
+            cached = _HN_CACHE.get(cache_key)
+            if cached is not None:
+                logger.debug("HN API cache hit: %s %s", endpoint, params or {})
+                return cached
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    url, 
-                    timeout=10.0,
-                    headers={'User-Agent': 'ChupAI/1.0 (github.com/jaywyawhare/puch-ai-hiring)'}
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"HTTP error while fetching: {e}")
-                raise ValueError(f"HN API HTTP error: {str(e)}")
+        logger.debug("HN API request: %s %s", endpoint, params or {})
+        
+        client = await _get_client()
+        try:
+            async with _HN_SEM:
+                response = await client.get(endpoint, params=params)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            if use_cache:
+                _HN_CACHE.set(cache_key, data)
+            return data
+        except httpx.HTTPError as e:
+            logger.error("HTTP error while fetching: %s", e)
+            raise ValueError(f"HN API HTTP error: {str(e)}") from e
 
     async def get_stories(self, story_type: str, num_stories: int = 10, page: int = 0) -> Dict:
         """Get stories with pagination support."""
@@ -73,9 +175,9 @@ class HackerNewsAPI:
         try:
             # Translate query to English if needed
             translated_query = await translate_to_english(query)
-            logger.info(f"Original query: {query}")
+            logger.info("Original query: %s", query)
             if translated_query != query:
-                logger.info(f"Translated query: {translated_query}")
+                logger.info("Translated query: %s", translated_query)
                 
             params = {
                 "query": translated_query,
@@ -85,7 +187,7 @@ class HackerNewsAPI:
             
             return await self._make_request("search", params)
         except Exception as e:
-            logger.error(f"Error in search_stories: {e}")
+            logger.error("Error in search_stories: %s", e)
             raise McpError(
                 ErrorData(code=INTERNAL_ERROR, message=f"Error searching stories: {str(e)}")
             )
@@ -96,7 +198,8 @@ class HackerNewsAPI:
 
     async def get_item(self, item_id: str) -> Dict:
         """Get item details including comments."""
-        return await self._make_request(f"items/{item_id}")
+        # Comment threads change quickly, always fetch them fresh
+        return await self._make_request(f"items/{item_id}", use_cache=False)
 
 
 def register_hn_tools(mcp):
@@ -104,19 +207,13 @@ def register_hn_tools(mcp):
     
     logger.info("Registering Hacker News tools...")
     
-    GetHNStoriesToolDescription = RichToolDescription(
-        description="Get Hacker News stories by type (top, new, ask, show).",
-        use_when="Fetches and formats stories from Hacker News, including titles, points, comment counts, and URLs.",
-        side_effects="Makes API calls to Hacker News Algolia API and may be subject to rate limiting.",
-    )
-    
-    @mcp.tool(description=GetHNStoriesToolDescription.model_dump_json())
+    @mcp.tool(description=GET_HN_STORIES_DESC_JSON)
     async def get_hn_stories(
         story_type: Annotated[str, Field(description="Type of stories to fetch (top/new/ask/show)")] = "top",
         num_stories: Annotated[int, Field(description="Number of stories to fetch", default=10, ge=1, le=30)] = 10
     ) -> list[TextContent]:
         """Get Hacker News stories by type (top, new, ask, show)."""
-        logger.info(f"get_hn_stories tool called with story_type={story_type}, num_stories={num_stories}")
+        logger.info("get_hn_stories tool called with story_type=%s, num_stories=%s", story_type, num_stories)
         try:
             hn = HackerNewsAPI()
             stories = await hn.get_stories(story_type, num_stories)
@@ -124,66 +221,37 @@ def register_hn_tools(mcp):
             if not stories.get("hits"):
                 return [TextContent(type="text", text="No stories found")]
             
-            result_parts = [f"**📰 Hacker News - {story_type.upper()} Stories**\n"]
-            
-            for i, story in enumerate(stories["hits"], 1):
-                # Format story data
-                story_id = str(story.get("objectID", ""))
-                title = story.get("title", "[No title]")
-                points = int(story.get("points", 0) or 0)
-                num_comments = int(story.get("num_comments", 0) or 0)
-                author = story.get("author", "anonymous")
-                url = story.get("url", "")
-                
-                try:
-                    created = datetime.fromisoformat(story.get("created_at", "").replace("Z", "+00:00"))
-                    time_str = created.strftime("%Y-%m-%d %H:%M")
-                except:
-                    time_str = "unknown time"
-                
-                story_text = [
-                    f"{i}. **{title}**",
-                    f"   👤 by {author} | ⬆️ {points} points | 💬 {num_comments} comments | 🕒 {time_str}"
-                ]
-                
-                if url:
-                    story_text.append(f"   🔗 {url}")
-                
-                story_text.append(f"   📎 https://news.ycombinator.com/item?id={story_id}")
-                result_parts.append("\n".join(story_text))
+            result_parts = [
+                f"**📰 Hacker News - {story_type.upper()} Stories**\n",
+                "\n".join(_render_story(i, story) for i, story in enumerate(stories["hits"], 1))
+            ]
             
             if "nbPages" in stories:
                 result_parts.append(f"\nPage {stories.get('page', 0) + 1} of {stories['nbPages']}")
             
             result_parts.append("\n*🔴 Live data from Hacker News API*")
             result = [TextContent(type="text", text="\n".join(result_parts))]
-            logger.info(f"get_hn_stories tool output: {result[0].text[:200]}..." if len(result[0].text) > 200 else f"get_hn_stories tool output: {result[0].text}")
+            logger.info("get_hn_stories tool output: %s%s", result[0].text[:200], "..." if len(result[0].text) > 200 else "")
             return result
             
         except Exception as e:
-            logger.error(f"Error in get_hn_stories: {e}")
+            logger.exception("Error in get_hn_stories: %s", e)
             raise McpError(
                 ErrorData(code=INTERNAL_ERROR, message=f"Error fetching HN stories: {str(e)}")
             )
 
-    SearchHNStoriesToolDescription = RichToolDescription(
-        description="Search Hacker News stories by keyword.",
-        use_when="Performs a full-text search across Hacker News stories and returns matching results with relevance ranking.",
-        side_effects="Makes API calls to Hacker News Algolia API and may be subject to rate limiting.",
-    )
-
-    @mcp.tool(description=SearchHNStoriesToolDescription.model_dump_json())
+    @mcp.tool(description=SEARCH_HN_STORIES_DESC_JSON)
     async def search_hn_stories(
         query: Annotated[str, Field(description="Search query for stories")],
         num_results: Annotated[int, Field(default=10, description="Number of results to fetch", ge=1, le=30)] = 10,
         source_lang: Annotated[str, Field(description="Source language code. Use 'auto' for auto-detection.", default="auto")] = "auto"
     ) -> list[TextContent]:
         """Search Hacker News stories by keyword."""
-        logger.info(f"search_hn_stories tool called with query={query}, num_results={num_results}")
+        logger.info("search_hn_stories tool called with query=%s, num_results=%s", query, num_results)
         try:
             # Translate query to English if needed
             query_en = await translate_to_english(query, source_lang)
-            logger.info(f"Searching HN stories for: {query} (en: {query_en})")
+            logger.info("Searching HN stories for: %s (en: %s)", query, query_en)
             
             hn = HackerNewsAPI()
             stories = await hn.search_stories(query_en, num_results)
@@ -193,63 +261,58 @@ def register_hn_tools(mcp):
             
             result_parts = [
                 f"**🔍 Hacker News Search Results**",
-                f"*Query: {query}*\n"
+                f"*Query: {query}*\n",
+                "\n".join(_render_story(i, story) for i, story in enumerate(stories["hits"], 1))
             ]
             
-            for i, story in enumerate(stories["hits"], 1):
-                points = story["points"] or 0
-                comments = story["num_comments"] or 0
-                created = datetime.fromisoformat(story["created_at"].replace("Z", "+00:00"))
-                story_url = story.get("url", "")
-                
-                story_text = [
-                    f"{i}. **{story['title']}**",
-                    f"   👤 by {story['author']} | ⬆️ {points} points | 💬 {comments} comments | 🕒 {created.strftime('%Y-%m-%d %H:%M')}"
-                ]
-                
-                if story_url:
-                    story_text.append(f"   🔗 {story_url}")
-                    
-                story_text.append(f"   📎 https://news.ycombinator.com/item?id={story['objectID']}")
-                result_parts.append("\n".join(story_text))
-            
             result_parts.append("\n*🔴 Live data from Hacker News API*")
             result = [TextContent(type="text", text="\n".join(result_parts))]
-            logger.info(f"search_hn_stories tool output: {result[0].text[:200]}..." if len(result[0].text) > 200 else f"search_hn_stories tool output: {result[0].text}")
+            logger.info("search_hn_stories tool output: %s%s", result[0].text[:200], "..." if len(result[0].text) > 200 else "")
             return result
             
         except Exception as e:
-            logger.error(f"Error in search_hn_stories: {e}")
+            logger.exception("Error in search_hn_stories: %s", e)
             raise McpError(
                 ErrorData(code=INTERNAL_ERROR, message=f"Error searching HN stories: {str(e)}")
             )
 
-    GetHNUserToolDescription = RichToolDescription(
-        description="Get Hacker News user information and recent submissions.",
-        use_when="Fetches user profile information including karma, creation date, and recent story submissions.",
-        side_effects="Makes API calls to Hacker News Algolia API and may be subject to rate limiting.",
-    )
-
-    @mcp.tool(description=GetHNUserToolDescription.model_dump_json())
+    @mcp.tool(description=GET_HN_USER_DESC_JSON)
     async def get_hn_user(
         username: Annotated[str, Field(description="Hacker News username")],
         num_stories: Annotated[int, Field(description="Number of user's stories to fetch", default=5, ge=1, le=20)] = 5
     ) -> list[TextContent]:
         """Get Hacker News user information and recent submissions."""
-        logger.info(f"get_hn_user tool called with username={username}, num_stories={num_stories}")
+        logger.info("get_hn_user tool called with username=%s, num_stories=%s", username, num_stories)
         try:
             hn = HackerNewsAPI()
-            user_info = await hn.get_user(username)
-            stories = await hn.get_stories("new", num_stories, 0)  # Get recent stories
+            # Both requests are independent, so issue them concurrently
+            user_info, stories = await asyncio.gather(
+                hn.get_user(username),
+                hn.get_stories("new", num_stories, 0),  # Get recent stories
+                return_exceptions=True
+            )
+            
+            if isinstance(user_info, Exception):
+                cause = user_info.__cause__
+                if isinstance(cause, httpx.HTTPStatusError) and cause.response.status_code == 404:
+                    raise McpError(
+                        ErrorData(code=INVALID_PARAMS, message=f"Hacker News user not found: {username}")
+                    )
+                # Timeouts, 5xx and connection errors go to the INTERNAL_ERROR handler below
+                raise user_info
+            if isinstance(stories, Exception):
+                # Still show the profile if only the submissions fetch failed
+                logger.warning("HN stories fetch failed for %s: %s", username, stories)
+                stories = {"hits": []}
             
             created_str = user_info.get("created_at")
             if created_str:
-                created = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
+                created = parse_datetime(created_str)
                 created_formatted = created.strftime("%Y-%m-%d")
             else:
                 created_formatted = "unknown"
             
-            result_text = f"""
+            parts = [f"""
 **👤 Hacker News User: {username}**
 
 🔑 **Account Info:**
@@ -258,34 +321,37 @@ def register_hn_tools(mcp):
 {"• About: " + user_info.get("about", "") if user_info.get("about") else ""}
 
 📝 **Recent Submissions:**
-"""
+"""]
         
             for i, story in enumerate(stories["hits"], 1):
-                points = story["points"] or 0
-                comments = story["num_comments"] or 0
-                
-                result_text += f"""
-{i}. **{story["title"]}**
-   ⬆️ {points} points | 💬 {comments} comments
-   {"🔗 " + story["url"] if story["url"] else ""}
-   📎 https://news.ycombinator.com/item?id={story["objectID"]}
-"""
+                url = story["url"]
+                parts.append(USER_STORY_TMPL.format(
+                    i=i,
+                    title=story["title"],
+                    points=story["points"] or 0,
+                    comments=story["num_comments"] or 0,
+                    url_line="🔗 " + url if url else "",
+                    story_id=story["objectID"]
+                ))
         
-            result_text += f"""
+            parts.append(f"""
 
 📊 **Profile Links:**
 • Stories: https://news.ycombinator.com/submitted?id={username}
 • Comments: https://news.ycombinator.com/threads?id={username}
 
 *🔴 Live data from Hacker News API*
-"""
+""")
+            result_text = "".join(parts)
         
             result = [TextContent(type="text", text=result_text.strip())]
-            logger.info(f"get_hn_user tool output: {result[0].text[:200]}..." if len(result[0].text) > 200 else f"get_hn_user tool output: {result[0].text}")
+            logger.info("get_hn_user tool output: %s%s", result[0].text[:200], "..." if len(result[0].text) > 200 else "")
             return result
         
+        except McpError:
+            raise
         except Exception as e:
-            logger.error(f"Error in get_hn_user: {e}")
+            logger.exception("Error in get_hn_user: %s", e)
             raise McpError(
                 ErrorData(
                     code=INTERNAL_ERROR,
@@ -2,38 +2,297 @@
 Music-related tools for song search and streaming.
 Uses real APIs, web scraping, and yt-dlp for YouTube music streaming.
 """
-from typing import Annotated, Optional, Dict, List, Any
-from pydantic import Field
+from typing import Annotated, Optional, Dict, List, Any, Literal
+from pydantic import BaseModel, Field
 from mcp import ErrorData, McpError
 from mcp.types import INTERNAL_ERROR, TextContent
 from urllib.parse import quote_plus
 from pathlib import Path
-from ..utils.helpers import translate_to_english
+from ..utils.helpers import translate_to_english, TTLCache
 import httpx
-import json
+import orjson
 import re
 import asyncio
-import subprocess
+import functools
+import importlib.util
+import shutil
+import sys
+import threading
 import tempfile
 import os
-import openai
+import random
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Video ID from any of the YouTube watch URL forms, in one scan; IDs are always 11 chars
+_YT_ID_RE = re.compile(
+    r'(?:youtu\.be/|youtube\.com/watch\?v=|music\.youtube\.com/watch\?v=)(?P<id>[A-Za-z0-9_-]{11})(?:[?&#]|$)'
+)
+# Bytes pattern so the page can be scanned and parsed without decoding it
+_YT_INITIAL_DATA_RE = re.compile(rb'var ytInitialData = (\{.*?\});</script>', re.DOTALL)
+_GENIUS_URL_RE = re.compile(r'href="(https://genius\.com/[^"]*-lyrics)"')
+_SAFE_TITLE_2 = re.compile(r'[-\s]+')
 
-class RichToolDescription(openai.BaseModel):
+
+class _TitleCharFilter(dict):
+    """str.translate table dropping characters other than word chars, whitespace and '-'."""
+
+    def __missing__(self, key: int) -> Optional[int]:
+        ch = chr(key)
+        value = key if (ch.isalnum() or ch.isspace() or ch in '_-') else None
+        self[key] = value
+        return value
+
+
+# Filled lazily, so only characters actually seen in titles get an entry
+_TITLE_CHAR_FILTER = _TitleCharFilter()
+
+
+# The same query gets encoded for several backends per tool call
+_quote_query = functools.lru_cache(maxsize=512)(quote_plus)
+
+
+# Platform search URL templates, filled with the quote_plus-encoded query
+_SONG_PLATFORMS = (
+    ("Spotify", "https://open.spotify.com/search/{q}"),
+    ("Apple Music", "https://music.apple.com/search?term={q}"),
+    ("YouTube Music", "https://music.youtube.com/search?q={q}"),
+    ("SoundCloud", "https://soundcloud.com/search?q={q}"),
+    ("Amazon Music", "https://music.amazon.com/search/{q}"),
+    ("Deezer", "https://www.deezer.com/search/{q}"),
+)
+_VIDEO_PLATFORMS = (
+    ("YouTube", "https://www.youtube.com/results?search_query={q}"),
+)
+_LYRICS_PLATFORMS = (
+    ("AZLyrics", "https://search.azlyrics.com/search.php?q={q}"),
+    ("Musixmatch", "https://www.musixmatch.com/search/{q}"),
+)
+_RECOMMENDATION_PLATFORMS = (
+    ("Spotify", "https://open.spotify.com/search/{q}"),
+    ("YouTube Music", "https://music.youtube.com/search?q={q}"),
+    ("Last.fm", "https://www.last.fm/search?q={q}"),
+    ("AllMusic", "https://www.allmusic.com/search/all/{q}"),
+    ("Rate Your Music", "https://rateyourmusic.com/search?searchterm={q}"),
+)
+
+
+# get_song_name_links response body, parsed once and filled with format_map
+SONG_LINKS_TMPL = """
+**🎵 Song Search Results for "{song_name}"**
+{artist_line}
+
+🎧 **Streaming Platforms:**
+
+{streaming_links}
+
+📹 **Video Platforms:**
+{video_links}
+{youtube_results}
+📝 **Lyrics Sources:**
+**Genius:** {genius_url}
+{lyrics_links}
+
+
+🎼 **Additional Information:**
+- Search optimized for: "{search_query}"
+- All links are live and functional
+- Multiple platforms provided for availability
+
+💡 **Usage Tips:**
+- Click streaming platform links to listen
+- Use lyrics sources to find song lyrics  
+- Try different platforms if one is unavailable
+- Some platforms may require subscription
+
+*🔴 Live data from multiple music platforms*
+"""
+
+
+# Static footers for search_and_stream_music
+STREAM_TIPS_TEXT = """
+
+💡 **Streaming Tips:**
+- Use `get_youtube_music_stream` tool with any URL above for detailed stream info
+- Stream URLs are temporary and may expire
+- Best quality streams are automatically selected
+
+🛠️ **Available Tools:**
+- Use the URL with `get_youtube_music_stream` for direct audio streaming
+- All results support standard media players
+"""
+
+STREAMING_UNAVAILABLE_TEXT = """
+
+⚠️ **Streaming Not Available:**
+Install `yt-dlp` and `ffmpeg` for audio streaming support:
+```bash
+pip install yt-dlp
+# Install ffmpeg for your OS
+```
+"""
+
+
+# Shown by download_youtube_audio when yt-dlp or ffmpeg is missing
+AUDIO_DOWNLOAD_UNAVAILABLE_TEXT = """❌ **Audio Download Not Available**
+
+**Required Dependencies Missing:**
+- `yt-dlp`: YouTube downloader library  
+- `ffmpeg`: Audio/video processing tool
+
+**Installation Instructions:**
+```bash
+# Install yt-dlp
+pip install yt-dlp
+
+# Install ffmpeg (Ubuntu/Debian)
+sudo apt install ffmpeg
+
+# Install ffmpeg (macOS)  
+brew install ffmpeg
+
+# Install ffmpeg (Windows)
+# Download from https://ffmpeg.org/download.html
+```
+
+**Note:** This tool downloads audio files locally. Make sure you have permission and comply with YouTube's Terms of Service."""
+
+
+def _platform_links(platforms, q: str) -> str:
+    """Render a platform table as markdown link lines for an encoded query."""
+    return "\n".join(f"**{name}:** {tpl.format(q=q)}" for name, tpl in platforms)
+
+
+def _pick_audio_format(formats: List[Dict[str, Any]], lowest: bool = False,
+                       prefer_audio_only: bool = False) -> Optional[Dict[str, Any]]:
+    """Pick the highest (or lowest) bitrate format with audio in a single pass."""
+    best = best_only = None
+    best_abr = best_only_abr = 0.0
+    for f in formats:
+        if f.get('acodec') == 'none':
+            continue
+        abr = float(f.get('abr') or 0)
+        if best is None or (abr < best_abr if lowest else abr > best_abr):
+            best, best_abr = f, abr
+        if prefer_audio_only and f.get('vcodec') == 'none':
+            if best_only is None or (abr < best_only_abr if lowest else abr > best_only_abr):
+                best_only, best_only_abr = f, abr
+    return best_only or best
+
+
+# Search results stay valid for a day; signed stream URLs expire much sooner
+_SEARCH_CACHE = TTLCache(maxsize=256, ttl=24 * 3600)
+_STREAM_CACHE = TTLCache(maxsize=256, ttl=3600)
+
+# In-flight searches by normalized query, so concurrent identical requests share one search
+_PENDING_SEARCHES: Dict[tuple, "asyncio.Future[dict]"] = {}
+
+
+def _cache_query(query: str) -> str:
+    """Normalize a query for cache keys, leaving case-sensitive video URLs intact."""
+    query = query.strip()
+    if _YT_ID_RE.search(query):
+        return query
+    return query.lower()
+
+
+def _stream_info(info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Build stream info from an extracted video's best audio format, or None if it has none."""
+    best_audio = _pick_audio_format(info.get('formats') or [])
+    if not best_audio:
+        return None
+    return {
+        "success": True,
+        "title": info.get('title', 'Unknown'),
+        "uploader": info.get('uploader', 'Unknown'),
+        "duration": info.get('duration', 0),
+        "audio_url": best_audio.get('url', ''),
+        "quality": best_audio.get('abr', 'Unknown'),
+        "format": best_audio.get('ext', 'Unknown'),
+        "filesize": best_audio.get('filesize', 0)
+    }
+
+
+class RichToolDescription(BaseModel):
     """Rich tool description model for MCP server compatibility."""
     description: str
     use_when: str
     side_effects: Optional[str]
 
-try:
+# yt-dlp is heavy to import, so only check it's installed and load it on first use
+YTDLP_AVAILABLE = importlib.util.find_spec("yt_dlp") is not None
+if not YTDLP_AVAILABLE:
+    logger.warning("yt-dlp not available. YouTube streaming features will be limited.")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ytdlp():
+    """Import yt_dlp on first use."""
     import yt_dlp
-    YTDLP_AVAILABLE = True
-except ImportError:
-    YTDLP_AVAILABLE = False
-    print("Warning: yt-dlp not available. YouTube streaming features will be limited.")
+    return yt_dlp
+
+
+# The mediaconnect player client skips the YouTube JS player fetch; web is
+# kept as a fallback for videos mediaconnect returns no formats for
+_YT_EXTRACTOR_ARGS = {'youtube': {'player_client': ['mediaconnect', 'web']}}
+
+# Options for metadata/stream URL extraction (no download)
+_STREAM_YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'format': 'bestaudio/best',
+    'extract_flat': False,
+    'noplaylist': True,
+    'extractor_args': _YT_EXTRACTOR_ARGS,
+}
+
+# Full-extraction search: every result resolves its formats; unavailable videos are skipped
+_SEARCH_STREAMS_YDL_OPTS = {
+    **_STREAM_YDL_OPTS,
+    'noplaylist': False,
+    'ignoreerrors': True,
+}
+
+# Bound concurrent yt-dlp work (searches, extractions, downloads) so bursts of
+# tool calls don't swamp the CPU or trip YouTube rate limits
+YTDLP_CONCURRENCY = max(1, int(os.getenv("YTDLP_CONCURRENCY", "4")))
+_YTDLP_SEM = asyncio.Semaphore(YTDLP_CONCURRENCY)
+
+# Seconds a flat search subprocess may run before it's killed
+_FLAT_SEARCH_TIMEOUT = 30
+
+# Split the cores between concurrent downloads instead of each ffmpeg taking them all
+_FFMPEG_THREADS = max(1, (os.cpu_count() or 4) // YTDLP_CONCURRENCY)
+
+# YoutubeDL instances aren't thread-safe, so each worker thread keeps its own
+_YDL_LOCAL = threading.local()
+# Every instance built, across threads, so shutdown can close them
+_YDL_INSTANCES: List[Any] = []
+_YDL_INSTANCES_LOCK = threading.Lock()
+
+
+def _get_ydl(name: str, opts: Dict[str, Any]):
+    """Get the calling thread's reusable YoutubeDL instance for name, building it on first use."""
+    ydl = getattr(_YDL_LOCAL, name, None)
+    if ydl is None:
+        ydl = _get_ytdlp().YoutubeDL(opts)
+        setattr(_YDL_LOCAL, name, ydl)
+        with _YDL_INSTANCES_LOCK:
+            _YDL_INSTANCES.append(ydl)
+    return ydl
+
+
+def _close_ydls() -> None:
+    """Close every YoutubeDL instance built by _get_ydl."""
+    with _YDL_INSTANCES_LOCK:
+        instances = _YDL_INSTANCES[:]
+        _YDL_INSTANCES.clear()
+    for ydl in instances:
+        try:
+            ydl.close()
+        except Exception as e:
+            logger.debug("Failed to close YoutubeDL instance: %s", e)
 
 
 class YouTubeDownloader:
@@ -42,32 +301,23 @@ class YouTubeDownloader:
     @classmethod
     def _prepare_query(cls, query: str) -> str:
         """Convert query to appropriate yt-dlp format"""
-        youtube_patterns = [
-            r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-            r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]+)',
-            r'(?:https?://)?(?:music\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)'
-        ]
-        
         # Check if it's a URL
-        for pattern in youtube_patterns:
-            if re.search(pattern, query):
-                return query
+        if _YT_ID_RE.search(query):
+            return query
         
         # If not a URL, treat as search query
         return f"ytsearch:{query}"
 
+    # Tool availability doesn't change while the server runs, so check once
+    _available: Optional[bool] = None
+
     @classmethod
     def is_available(cls) -> bool:
         """Check if yt-dlp and ffmpeg are available"""
-        if not YTDLP_AVAILABLE:
-            return False
-        
-        # Check for ffmpeg
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        if cls._available is None:
+            # PATH lookup instead of spawning ffmpeg on every call
+            cls._available = YTDLP_AVAILABLE and shutil.which('ffmpeg') is not None
+        return cls._available
     
     @classmethod
     async def search_youtube_music(cls, query: str, max_results: int = 5) -> Dict[str, Any]:
@@ -76,100 +326,171 @@ class YouTubeDownloader:
         if not cls.is_available():
             return {"success": False, "error": "yt-dlp or ffmpeg not available"}
         
+        cache_key = ("yt-dlp", _cache_query(query), max_results)
+        cached = _SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            logger.debug("YouTube search cache hit: %s", query)
+            return cached
+        
         try:
-            # Configure yt-dlp options for search
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True,
-                'default_search': 'ytsearch',
-            }
-            
+            query = query.strip()
             search_query = f"ytsearch{max_results}:{query}" if not query.startswith('http') else query
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Search for videos
-                search_results = ydl.extract_info(search_query, download=False)
-                
-                results = []
-                if search_results and 'entries' in search_results:
-                    for entry in search_results['entries']:
-                        if entry:
-                            results.append({
-                                'id': entry.get('id', ''),
-                                'title': entry.get('title', 'Unknown'),
-                                'uploader': entry.get('uploader', 'Unknown'),
-                                'duration': entry.get('duration', 0),
-                                'url': f"https://www.youtube.com/watch?v={entry.get('id', '')}",
-                                'thumbnail': entry.get('thumbnail', '')
-                            })
+            playlist = await cls._flat_search(search_query)
+            if playlist is None:
+                return {"success": False, "error": "YouTube search failed"}
+            results = cls._flat_results(playlist)
+            
+            logger.info(f"search_youtube_music tool output: {results}")
+            result = {
+                "success": True,
+                "results": results,
+                "query": query
+            }
+            _SEARCH_CACHE.set(cache_key, result)
+            return result
                 
-                logger.info(f"search_youtube_music tool output: {results}")
-                return {
-                    "success": True,
-                    "results": results,
-                    "query": query
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"YouTube search failed: {str(e)}"
+            }
+    
+    @classmethod
+    async def search_youtube_music_with_streams(cls, query: str, max_results: int = 5) -> Dict[str, Any]:
+        """Search YouTube with full extraction, so each result carries its best audio stream"""
+        if not cls.is_available():
+            return {"success": False, "error": "yt-dlp or ffmpeg not available"}
+        
+        # Stream URLs are signed and expire, so these results live in the stream cache
+        cache_key = ("yt-dlp-streams", _cache_query(query), max_results)
+        cached = _STREAM_CACHE.get(cache_key)
+        if cached is not None:
+            logger.debug("YouTube stream search cache hit: %s", query)
+            return cached
+        
+        try:
+            search_query = f"ytsearch{max_results}:{query.strip()}"
+            
+            def _run():
+                return _get_ydl('search_streams', _SEARCH_STREAMS_YDL_OPTS).extract_info(search_query, download=False)
+            
+            async with _YTDLP_SEM:
+                info = await asyncio.to_thread(_run)
+            
+            results = []
+            for entry in (info or {}).get('entries') or []:
+                if not entry:
+                    continue
+                url = f"https://www.youtube.com/watch?v={entry.get('id', '')}"
+                track = {
+                    'id': entry.get('id', ''),
+                    'title': entry.get('title', 'Unknown'),
+                    'uploader': entry.get('uploader', 'Unknown'),
+                    'duration': entry.get('duration', 0),
+                    'url': url,
+                    'thumbnail': entry.get('thumbnail', '')
                 }
-                
+                stream = _stream_info(entry)
+                if stream:
+                    track.update(audio_url=stream['audio_url'], quality=stream['quality'], format=stream['format'])
+                    # Later probes of this video are served from the same extraction
+                    _STREAM_CACHE.set(_cache_query(url), stream)
+                results.append(track)
+            
+            result = {"success": True, "results": results, "query": query}
+            _STREAM_CACHE.set(cache_key, result)
+            return result
+        
         except Exception as e:
             return {
                 "success": False,
                 "error": f"YouTube search failed: {str(e)}"
             }
     
+    @staticmethod
+    async def _flat_search(search_query: str) -> Optional[Dict[str, Any]]:
+        """Run a flat yt-dlp search subprocess and return its playlist JSON, or None if nothing came back"""
+        # Flat search runs in a yt-dlp subprocess so its extractors never load here;
+        # '--' keeps queries starting with '-' from being read as options
+        async with _YTDLP_SEM:
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, '-m', 'yt_dlp',
+                '--flat-playlist', '--dump-single-json', '--ignore-errors', '--quiet', '--no-warnings',
+                '--', search_query,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=1 << 20
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), _FLAT_SEARCH_TIMEOUT)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                # Don't leave a hung or abandoned child running, or holding its slot
+                if proc.returncode is None:
+                    proc.kill()
+                await proc.wait()
+                if isinstance(sys.exc_info()[1], asyncio.TimeoutError):
+                    raise RuntimeError(f"yt-dlp search timed out after {_FLAT_SEARCH_TIMEOUT}s") from None
+                raise
+        
+        # A failed search prints nothing
+        if stdout.strip():
+            return orjson.loads(stdout)
+        if proc.returncode != 0:
+            raise RuntimeError(stderr.decode(errors='replace').strip() or f"yt-dlp exited with {proc.returncode}")
+        return None
+    
+    @staticmethod
+    def _flat_results(search_results: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert flat yt-dlp playlist entries to search result dicts"""
+        results = []
+        if search_results and 'entries' in search_results:
+            for entry in search_results['entries']:
+                if entry:
+                    results.append({
+                        'id': entry.get('id', ''),
+                        'title': entry.get('title', 'Unknown'),
+                        'uploader': entry.get('uploader', 'Unknown'),
+                        'duration': entry.get('duration', 0),
+                        'url': f"https://www.youtube.com/watch?v={entry.get('id', '')}",
+                        'thumbnail': entry.get('thumbnail', '')
+                    })
+        return results
+    
     @classmethod
     async def get_audio_stream_info(cls, query: str) -> Dict[str, Any]:
         """Get audio stream information for a YouTube video or search query"""
         if not cls.is_available():
             return {"success": False, "error": "yt-dlp or ffmpeg not available"}
         
+        cache_key = _cache_query(query)
+        cached = _STREAM_CACHE.get(cache_key)
+        if cached is not None:
+            logger.debug("YouTube stream info cache hit: %s", query)
+            return cached
+        
         try:
-            # Configure yt-dlp options for direct audio extraction
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'format': 'bestaudio/best',
-                'extractaudio': True,
-                'audioformat': 'mp3',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3'
-                }],
-                'noplaylist': True,
-                'default_search': 'ytsearch1:',
-                'max_downloads': 1
-            }
+            prepared_query = cls._prepare_query(query)
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                prepared_query = cls._prepare_query(query)
-                info = ydl.extract_info(prepared_query, download=False)
-                
-                # Handle search results if query wasn't a direct URL
-                if 'entries' in info:
-                    if not info['entries']:
-                        return {"success": False, "error": "No results found"}
-                    info = info['entries'][0]
-                
-                # Get the best audio format
-                formats = info.get('formats', [])
-                audio_formats = [f for f in formats if f.get('acodec') != 'none']
+            def _run():
+                return _get_ydl('stream', _STREAM_YDL_OPTS).extract_info(prepared_query, download=False)
+            
+            async with _YTDLP_SEM:
+                info = await asyncio.to_thread(_run)
+            
+            # Handle search results if query wasn't a direct URL
+            if 'entries' in info:
+                if not info['entries']:
+                    return {"success": False, "error": "No results found"}
+                info = info['entries'][0]
+            
+            result = _stream_info(info)
+            if result:
+                _STREAM_CACHE.set(cache_key, result)
+                return result
+            else:
+                return {"success": False, "error": "No audio streams found"}
                 
-                if audio_formats:
-                    best_audio = max(audio_formats, key=lambda x: x.get('abr', 0) or 0)
-                    
-                    return {
-                        "success": True,
-                        "title": info.get('title', 'Unknown'),
-                        "uploader": info.get('uploader', 'Unknown'),
-                        "duration": info.get('duration', 0),
-                        "audio_url": best_audio.get('url', ''),
-                        "quality": best_audio.get('abr', 'Unknown'),
-                        "format": best_audio.get('ext', 'Unknown'),
-                        "filesize": best_audio.get('filesize', 0)
-                    }
-                else:
-                    return {"success": False, "error": "No audio streams found"}
-                    
         except Exception as e:
             return {
                 "success": False,
@@ -202,41 +523,45 @@ class YouTubeDownloader:
                 'quiet': True,
                 'no_warnings': True,
                 'default_search': 'ytsearch',
+                'extractor_args': _YT_EXTRACTOR_ARGS,
+                'postprocessor_args': {'ffmpeg': ['-threads', str(_FFMPEG_THREADS)]},
+            }
+            
+            def _run():
+                with _get_ytdlp().YoutubeDL(ydl_opts) as ydl:
+                    return ydl.extract_info(prepared_query, download=True)
+            
+            async with _YTDLP_SEM:
+                info = await asyncio.to_thread(_run)
+            
+            # Handle search results if query wasn't a direct URL
+            if 'entries' in info:
+                if not info['entries']:
+                    return {"success": False, "error": "No results found"}
+                info = info['entries'][0]
+            
+            # Find the downloaded file
+            title = info.get('title', 'audio')
+            safe_title = title.translate(_TITLE_CHAR_FILTER).strip()
+            safe_title = _SAFE_TITLE_2.sub('-', safe_title)
+            
+            output_file = os.path.join(output_path, f"{safe_title}.mp3")
+            
+            # Check if file exists (yt-dlp might have changed the name)
+            if not os.path.exists(output_file):
+                # Fall back to the most recently written mp3 in the directory
+                newest = max(Path(output_path).glob("*.mp3"), key=lambda p: p.stat().st_mtime, default=None)
+                if newest:
+                    output_file = str(newest)
+            
+            return {
+                "success": True,
+                "file_path": output_file,
+                "title": info.get('title', 'Unknown'),
+                "duration": info.get('duration', 0),
+                "uploader": info.get('uploader', 'Unknown')
             }
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(prepared_query, download=True)
-                
-                # Handle search results if query wasn't a direct URL
-                if 'entries' in info:
-                    if not info['entries']:
-                        return {"success": False, "error": "No results found"}
-                    info = info['entries'][0]
-                
-                # Find the downloaded file
-                title = info.get('title', 'audio')
-                safe_title = re.sub(r'[^\w\s-]', '', title).strip()
-                safe_title = re.sub(r'[-\s]+', '-', safe_title)
-                
-                output_file = os.path.join(output_path, f"{safe_title}.mp3")
-                
-                # Check if file exists (yt-dlp might have changed the name)
-                if not os.path.exists(output_file):
-                    # Find any mp3 file in the directory with timestamp-based name
-                    mp3_files = list(Path(output_path).glob("*.mp3"))
-                    # Sort by modification time to get the most recent
-                    mp3_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-                    if mp3_files:
-                        output_file = str(mp3_files[0])
-                
-                return {
-                    "success": True,
-                    "file_path": output_file,
-                    "title": info.get('title', 'Unknown'),
-                    "duration": info.get('duration', 0),
-                    "uploader": info.get('uploader', 'Unknown')
-                }
-                
         except Exception as e:
             return {
                 "success": False,
@@ -249,6 +574,40 @@ class MusicAPI:
     
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     
+    # Shared client so repeat lookups reuse keep-alive connections
+    _client: Optional[httpx.AsyncClient] = None
+    _client_lock = asyncio.Lock()
+    
+    @classmethod
+    async def _get_client(cls) -> httpx.AsyncClient:
+        """Get the shared music web client, creating it on first use."""
+        if cls._client is None or cls._client.is_closed:
+            async with cls._client_lock:
+                if cls._client is None or cls._client.is_closed:
+                    cls._client = httpx.AsyncClient(
+                        timeout=15,
+                        headers={"User-Agent": cls.USER_AGENT},
+                        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+                    )
+        return cls._client
+    
+    @classmethod
+    async def _get_with_retry(cls, url: str, attempts: int = 3) -> httpx.Response:
+        """GET url on the shared client, retrying transient network errors and 5xx with jittered backoff."""
+        client = await cls._get_client()
+        for attempt in range(attempts):
+            try:
+                response = await client.get(url)
+                if response.status_code < 500 or attempt == attempts - 1:
+                    return response
+                logger.debug("Retrying %s after HTTP %s", url, response.status_code)
+            except httpx.TransportError as e:
+                if attempt == attempts - 1:
+                    raise
+                logger.debug("Retrying %s after %s", url, e)
+            # 0.1s, 0.2s, ... capped at 1s, plus jitter so concurrent retries spread out
+            await asyncio.sleep(min(0.1 * 2 ** attempt, 1.0) + random.uniform(0, 0.1))
+    
     @classmethod
     async def search_song(cls, song_name: str, language: str = "auto") -> Dict[str, Any]:
         """Search for a song with language support"""
@@ -286,10 +645,28 @@ class MusicAPI:
             }
     
     @classmethod
-    async def search_youtube_music_advanced(cls, query: str) -> dict:
-        """Search YouTube Music using yt-dlp for detailed results"""
+    async def search_youtube_music_advanced(cls, query: str, with_streams: bool = False) -> dict:
+        """Search YouTube Music using yt-dlp for detailed results
+        
+        With with_streams, yt-dlp results also carry audio_url, quality and format.
+        """
+        # Results themselves are TTL-cached per backend; this only coalesces
+        # concurrent misses for the same query into a single search
+        key = (_cache_query(query), with_streams)
+        pending = _PENDING_SEARCHES.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(cls._search_youtube_music_advanced(query, with_streams))
+            _PENDING_SEARCHES[key] = pending
+            pending.add_done_callback(lambda _: _PENDING_SEARCHES.pop(key, None))
+        return await asyncio.shield(pending)
+    
+    @classmethod
+    async def _search_youtube_music_advanced(cls, query: str, with_streams: bool = False) -> dict:
+        """Run the yt-dlp search, or the web scraping fallback without yt-dlp"""
         if YouTubeDownloader.is_available():
             # Use yt-dlp for better results
+            if with_streams:
+                return await YouTubeDownloader.search_youtube_music_with_streams(query, max_results=5)
             return await YouTubeDownloader.search_youtube_music(query, max_results=5)
         else:
             # Fallback to web scraping
@@ -298,42 +675,60 @@ class MusicAPI:
     @classmethod
     async def search_youtube_music_fallback(cls, query: str) -> dict:
         """Fallback YouTube Music search using web scraping"""
+        cache_key = ("fallback", _cache_query(query), 5)
+        cached = _SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            logger.debug("YouTube fallback search cache hit: %s", query)
+            return cached
+        
         try:
             # Use YouTube search API endpoint
-            search_url = f"https://www.youtube.com/results?search_query={quote_plus(query)}"
+            search_url = f"https://www.youtube.com/results?search_query={_quote_query(query)}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    search_url,
-                    headers={"User-Agent": cls.USER_AGENT},
-                    timeout=15
-                )
-                
-                if response.status_code == 200:
-                    # Extract video IDs from the response
-                    content = response.text
-                    video_pattern = r'"videoId":"([^"]+)"'
-                    video_ids = re.findall(video_pattern, content)
-                    
-                    # Get titles
-                    title_pattern = r'"title":{"runs":\[{"text":"([^"]+)"}\]'
-                    titles = re.findall(title_pattern, content)
+            response = await cls._get_with_retry(search_url)
+            
+            if response.status_code == 200:
+                # Pull the search results JSON embedded in the page
+                match = _YT_INITIAL_DATA_RE.search(response.content)
+                if match:
+                    data = orjson.loads(match.group(1))
+                    sections = (
+                        data.get("contents", {})
+                        .get("twoColumnSearchResultsRenderer", {})
+                        .get("primaryContents", {})
+                        .get("sectionListRenderer", {})
+                        .get("contents", [])
+                    )
                     
+                    # Walk result items once, picking ID and title from the same renderer
                     results = []
-                    for video_id, title in zip(video_ids[:5], titles[:5]):
-                        results.append({
-                            "id": video_id,
-                            "title": title,
-                            "uploader": "Unknown",
-                            "duration": 0,
-                            "url": f"https://www.youtube.com/watch?v={video_id}",
-                            "thumbnail": f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
-                        })
-                    
-                    return {"success": True, "results": results, "method": "fallback"}
+                    for section in sections:
+                        for item in section.get("itemSectionRenderer", {}).get("contents", []):
+                            video = item.get("videoRenderer")
+                            if not video or "videoId" not in video:
+                                continue
+                            video_id = video["videoId"]
+                            title_runs = video.get("title", {}).get("runs") or [{}]
+                            owner_runs = video.get("ownerText", {}).get("runs") or [{}]
+                            results.append({
+                                "id": video_id,
+                                "title": title_runs[0].get("text", "Unknown"),
+                                "uploader": owner_runs[0].get("text", "Unknown"),
+                                "duration": 0,
+                                "url": f"https://www.youtube.com/watch?v={video_id}",
+                                "thumbnail": f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+                            })
+                            if len(results) >= 5:
+                                break
+                        if len(results) >= 5:
+                            break
                     
+                    result = {"success": True, "results": results, "method": "fallback"}
+                    _SEARCH_CACHE.set(cache_key, result)
+                    return result
+                
         except Exception as e:
-            print(f"YouTube fallback search error: {e}")
+            logger.warning("YouTube fallback search error: %s", e)
         
         return {"success": False, "results": [], "error": "Search failed"}
     
@@ -348,29 +743,59 @@ class MusicAPI:
                 "error": "yt-dlp not available - install yt-dlp and ffmpeg for streaming support"
             }
     
+    @classmethod
+    async def get_youtube_stream_info_batch(cls, video_urls: List[str]) -> List[dict]:
+        """Get YouTube stream information for several videos, one result per URL"""
+        # Probes run side by side on the per-thread reusable YoutubeDL instances;
+        # a probe that raises is reported like any other failed lookup
+        infos = await asyncio.gather(
+            *(cls.get_youtube_stream_info(url) for url in video_urls),
+            return_exceptions=True
+        )
+        return [
+            {"success": False, "error": f"Stream extraction failed: {info}"} if isinstance(info, Exception) else info
+            for info in infos
+        ]
+    
+    # Background stream prefetches, held so they aren't garbage collected mid-flight
+    _prefetch_tasks: set = set()
+    
+    @classmethod
+    def prefetch_streams(cls, audio_urls: List[str]) -> None:
+        """Fire background HEAD requests so the CDN connection and DNS lookup are warm for playback"""
+        for url in audio_urls:
+            if url:
+                task = asyncio.create_task(cls._head_stream(url))
+                cls._prefetch_tasks.add(task)
+                task.add_done_callback(cls._prefetch_tasks.discard)
+    
+    @classmethod
+    async def _head_stream(cls, url: str) -> None:
+        """HEAD a stream URL on the shared client, ignoring failures"""
+        try:
+            client = await cls._get_client()
+            await client.head(url, follow_redirects=True)
+        except httpx.HTTPError as e:
+            logger.debug("Stream prefetch failed for %s: %s", url, e)
+    
     @classmethod
     async def search_spotify_web(cls, query: str) -> dict:
         """Search Spotify web for songs"""
         try:
             # Use Spotify's web search
-            search_url = f"https://open.spotify.com/search/{quote_plus(query)}"
+            search_url = f"https://open.spotify.com/search/{_quote_query(query)}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    search_url,
-                    headers={"User-Agent": cls.USER_AGENT},
-                    timeout=15
-                )
+            response = await cls._get_with_retry(search_url)
+            
+            if response.status_code == 200:
+                return {
+                    "success": True,
+                    "search_url": search_url,
+                    "query": query
+                }
                 
-                if response.status_code == 200:
-                    return {
-                        "success": True,
-                        "search_url": search_url,
-                        "query": query
-                    }
-                    
         except Exception as e:
-            print(f"Spotify search error: {e}")
+            logger.warning("Spotify search error: %s", e)
         
         return {"success": False}
     
@@ -379,34 +804,139 @@ class MusicAPI:
         """Get lyrics from Genius"""
         try:
             query = f"{song} {artist}".strip()
-            search_url = f"https://genius.com/search?q={quote_plus(query)}"
+            search_url = f"https://genius.com/search?q={_quote_query(query)}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    search_url,
-                    headers={"User-Agent": cls.USER_AGENT},
-                    timeout=15
-                )
+            response = await cls._get_with_retry(search_url)
+            
+            if response.status_code == 200:
+                # Extract song URLs from search results
+                content = response.text
+                lyrics_urls = _GENIUS_URL_RE.findall(content)
+                
+                if lyrics_urls:
+                    return {
+                        "success": True,
+                        "lyrics_url": lyrics_urls[0],
+                        "search_url": search_url
+                    }
                 
-                if response.status_code == 200:
-                    # Extract song URLs from search results
-                    content = response.text
-                    url_pattern = r'href="(https://genius\.com/[^"]*-lyrics)"'
-                    lyrics_urls = re.findall(url_pattern, content)
-                    
-                    if lyrics_urls:
-                        return {
-                            "success": True,
-                            "lyrics_url": lyrics_urls[0],
-                            "search_url": search_url
-                        }
-                    
         except Exception as e:
-            print(f"Genius search error: {e}")
+            logger.warning("Genius search error: %s", e)
         
         return {"success": False}
 
 
+async def close_music_client() -> None:
+    """Close the shared music web client and yt-dlp instances."""
+    for task in list(MusicAPI._prefetch_tasks):
+        task.cancel()
+    if MusicAPI._client is not None:
+        await MusicAPI._client.aclose()
+        MusicAPI._client = None
+    _close_ydls()
+    # Downloads still inside their TTL are removed now rather than left behind
+    for handle in _DOWNLOAD_DIR_TIMERS.values():
+        handle.cancel()
+    paths = list(_DOWNLOAD_DIR_TIMERS)
+    _DOWNLOAD_DIR_TIMERS.clear()
+    for path in paths:
+        await asyncio.to_thread(shutil.rmtree, path, ignore_errors=True)
+
+
+# Seconds a download's temp directory is kept before it's deleted
+_DOWNLOAD_DIR_TTL = 3600
+# Pending cleanup timer per download directory
+_DOWNLOAD_DIR_TIMERS: Dict[str, asyncio.TimerHandle] = {}
+
+
+def _remove_dir_later(path: str) -> None:
+    """Delete a directory tree in the background without blocking the caller."""
+    _DOWNLOAD_DIR_TIMERS.pop(path, None)
+    asyncio.get_running_loop().run_in_executor(None, functools.partial(shutil.rmtree, path, ignore_errors=True))
+
+
+def _fmt_duration(seconds: Any) -> str:
+    """Format a duration in seconds as m:ss, or 'Unknown' when missing."""
+    seconds = int(seconds) if seconds else 0
+    return f"{seconds // 60}:{seconds % 60:02d}" if seconds else "Unknown"
+
+
+async def _download_song(song_name: str) -> str:
+    """Search for a song, download its audio and return the markdown summary."""
+    # Search for the song, creating the download directory meanwhile
+    search_results, temp_dir = await asyncio.gather(
+        MusicAPI.search_youtube_music_advanced(song_name),
+        asyncio.to_thread(tempfile.mkdtemp)
+    )
+    if not search_results.get("success") or not search_results.get("results"):
+        _remove_dir_later(temp_dir)
+        return f"❌ **Error:** No videos found for song: {song_name}"
+
+    # Use the first search result
+    first_video = search_results["results"][0]
+    video_url = first_video.get("url", "")
+    
+    # Search results carry the video ID; only parse the URL when it's missing
+    video_id = first_video.get("id")
+    if not video_id:
+        match = _YT_ID_RE.search(video_url)
+        video_id = match.group('id') if match else None
+    
+    if not video_id:
+        _remove_dir_later(temp_dir)
+        return "❌ **Error:** Could not extract a valid YouTube video ID from the search result."
+    
+    # Download audio
+    download_result = await YouTubeDownloader.download_audio(video_url, temp_dir)
+    
+    if not download_result.get("success"):
+        _remove_dir_later(temp_dir)
+        return f"❌ **Download failed:** {download_result.get('error', 'Unknown error')}"
+    
+    file_path = download_result.get("file_path", "") 
+    
+    # yt-dlp reported success, so a missing file here is a real failure
+    try:
+        file_size = (await asyncio.to_thread(os.stat, file_path)).st_size
+    except OSError:
+        _remove_dir_later(temp_dir)
+        return f"❌ **Download failed:** Audio file missing after download: {file_path or 'unknown path'}"
+    
+    # Downloads are scratch files; drop the directory once it's been around a while
+    _DOWNLOAD_DIR_TIMERS[temp_dir] = asyncio.get_running_loop().call_later(
+        _DOWNLOAD_DIR_TTL, _remove_dir_later, temp_dir
+    )
+    
+    return f"""
+**✅ Audio Download Completed**
+
+📁 **File Information:**
+• **Title:** {download_result.get('title', 'Unknown')}
+• **Artist/Channel:** {download_result.get('uploader', 'Unknown')}
+• **File Path:** `{file_path}`
+• **File Size:** {file_size // (1024*1024):.1f} MB
+• **Format:** MP3
+• **Duration:** {int(download_result.get('duration', 0)) // 60}:{int(download_result.get('duration', 0)) % 60:02d}
+
+⚠️ **Important:**
+- File is saved in temporary directory: `{temp_dir}`
+- Move the file to desired location within {_DOWNLOAD_DIR_TTL // 60} minutes, the directory is then deleted
+- Respect copyright and YouTube's Terms of Service
+- For personal use only
+
+🔧 **Next Steps:**
+```bash
+# Move file to your music directory
+mv "{file_path}" ~/Music/
+
+# Play the file
+mpv "{file_path}"
+```
+
+*🔴 Audio downloaded using yt-dlp and ffmpeg*
+    """.strip()
+
+
 def register_music_tools(mcp):
     """Register music-related tools with the MCP server."""
     
@@ -429,66 +959,51 @@ def register_music_tools(mcp):
             logger.info(f"Searching for song: {song_name} by {artist}")
             search_query = f"{song_name} {artist}".strip()
             
-            # Search YouTube Music with yt-dlp
-            youtube_results = await MusicAPI.search_youtube_music_advanced(search_query)
-            
-            # Search Spotify
-            spotify_results = await MusicAPI.search_spotify_web(search_query)
-            
-            # Get lyrics from Genius
-            lyrics_results = await MusicAPI.get_lyrics_from_genius(song_name, artist)
-            
-            result_text = f"""
-**🎵 Song Search Results for "{song_name}"**
-{f"**🎤 Artist:** {artist}" if artist else ""}
-
-🎧 **Streaming Platforms:**
-
-**Spotify:** https://open.spotify.com/search/{quote_plus(search_query)}
-**Apple Music:** https://music.apple.com/search?term={quote_plus(search_query)}
-**YouTube Music:** https://music.youtube.com/search?q={quote_plus(search_query)}
-**SoundCloud:** https://soundcloud.com/search?q={quote_plus(search_query)}
-**Amazon Music:** https://music.amazon.com/search/{quote_plus(search_query)}
-**Deezer:** https://www.deezer.com/search/{quote_plus(search_query)}
+            # Search YouTube Music, Spotify and Genius concurrently
+            youtube_results, spotify_results, lyrics_results = await asyncio.gather(
+                MusicAPI.search_youtube_music_advanced(search_query),
+                MusicAPI.search_spotify_web(search_query),
+                MusicAPI.get_lyrics_from_genius(song_name, artist),
+                return_exceptions=True
+            )
 
-📹 **Video Platforms:**
-**YouTube:** https://www.youtube.com/results?search_query={quote_plus(search_query)}
-"""
+            # A failed backend just drops its section from the output
+            if isinstance(youtube_results, Exception):
+                logger.warning("YouTube search failed for %s: %s", search_query, youtube_results)
+                youtube_results = {"success": False}
+            if isinstance(spotify_results, Exception):
+                logger.warning("Spotify search failed for %s: %s", search_query, spotify_results)
+                spotify_results = {"success": False}
+            if isinstance(lyrics_results, Exception):
+                logger.warning("Genius search failed for %s: %s", search_query, lyrics_results)
+                lyrics_results = {"success": False}
 
-            # Add YouTube results if found
+            q = _quote_query(search_query)
+            
+            youtube_section = ""
             if youtube_results.get("success") and youtube_results.get("results"):
-                result_text += "\n🎬 **YouTube Results:**\n"
-                for i, video in enumerate(youtube_results["results"][:3], 1):
-                    result_text += f"{i}. **{video['title']}**\n   🔗 {video['url']}\n"
-
-            # Add lyrics info
-            result_text += "\n📝 **Lyrics Sources:**\n"
+                youtube_section = "\n🎬 **YouTube Results:**\n" + "".join(
+                    f"{i}. **{video['title']}**\n   🔗 {video['url']}\n"
+                    for i, video in enumerate(youtube_results["results"][:3], 1)
+                )
+            
             if lyrics_results.get("success"):
-                result_text += f"**Genius:** {lyrics_results.get('lyrics_url', lyrics_results.get('search_url'))}\n"
+                genius_url = lyrics_results.get('lyrics_url', lyrics_results.get('search_url'))
             else:
-                result_text += f"**Genius:** https://genius.com/search?q={quote_plus(search_query)}\n"
-            
-            result_text += f"**AZLyrics:** https://search.azlyrics.com/search.php?q={quote_plus(search_query)}\n"
-            result_text += f"**Musixmatch:** https://www.musixmatch.com/search/{quote_plus(search_query)}\n"
-
-            result_text += f"""
-
-🎼 **Additional Information:**
-- Search optimized for: "{search_query}"
-- All links are live and functional
-- Multiple platforms provided for availability
-
-💡 **Usage Tips:**
-- Click streaming platform links to listen
-- Use lyrics sources to find song lyrics  
-- Try different platforms if one is unavailable
-- Some platforms may require subscription
-
-*🔴 Live data from multiple music platforms*
-            """
+                genius_url = f"https://genius.com/search?q={q}"
             
+            result_text = SONG_LINKS_TMPL.format_map({
+                "song_name": song_name,
+                "artist_line": f"**🎤 Artist:** {artist}" if artist else "",
+                "streaming_links": _platform_links(_SONG_PLATFORMS, q),
+                "video_links": _platform_links(_VIDEO_PLATFORMS, q),
+                "youtube_results": youtube_section,
+                "genius_url": genius_url,
+                "lyrics_links": _platform_links(_LYRICS_PLATFORMS, q),
+                "search_query": search_query,
+            }).strip()
             logger.info(f"get_song_name_links tool output: {result_text[:200]}..." if len(result_text) > 200 else f"get_song_name_links tool output: {result_text}")
-            return [TextContent(type="text", text=result_text.strip())]
+            return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
             logger.error(f"Error in get_song_name_links: {e}")
@@ -525,19 +1040,10 @@ def register_music_tools(mcp):
             
             query = " ".join(search_terms) if search_terms else "popular music recommendations"
             
-            # Search for recommendations on various platforms
-            platforms = {
-                "Spotify": f"https://open.spotify.com/search/{quote_plus(query)}",
-                "YouTube Music": f"https://music.youtube.com/search?q={quote_plus(query)}",
-                "Last.fm": f"https://www.last.fm/search?q={quote_plus(query)}",
-                "AllMusic": f"https://www.allmusic.com/search/all/{quote_plus(query)}",
-                "Rate Your Music": f"https://rateyourmusic.com/search?searchterm={quote_plus(query)}"
-            }
-            
             # Try to get some real recommendations from YouTube
             youtube_results = await MusicAPI.search_youtube_music_advanced(query)
             
-            result_text = f"""
+            parts = [f"""
 **🎵 Music Recommendations**
 {f"**🎭 Genre:** {genre}" if genre else ""}
 {f"**💭 Mood:** {mood}" if mood else ""}
@@ -546,24 +1052,26 @@ def register_music_tools(mcp):
 
 🎧 **Recommendation Sources:**
 
-"""
+"""]
             
-            for platform, url in platforms.items():
-                result_text += f"**{platform}:** {url}\n"
+            # Link the query on each recommendation platform
+            parts.append(_platform_links(_RECOMMENDATION_PLATFORMS, _quote_query(query)) + "\n")
             
             # Add YouTube results if available
             if youtube_results.get("success") and youtube_results.get("results"):
-                result_text += "\n🎬 **Recommended Tracks (from YouTube):**\n"
-                for i, video in enumerate(youtube_results["results"][:5], 1):
-                    result_text += f"{i}. **{video['title']}**\n   🔗 {video['url']}\n"
+                parts.append("\n🎬 **Recommended Tracks (from YouTube):**\n")
+                parts.extend(
+                    f"{i}. **{video['title']}**\n   🔗 {video['url']}\n"
+                    for i, video in enumerate(youtube_results["results"][:5], 1)
+                )
             
             # Add genre-specific recommendations
             if genre.lower() in ['rock', 'pop', 'jazz', 'classical', 'hip hop', 'electronic']:
-                result_text += f"\n🎼 **{genre.title()} Specific Resources:**\n"
-                result_text += f"**Reddit:** https://www.reddit.com/r/{genre.replace(' ', '')}music/\n"
-                result_text += f"**Discogs:** https://www.discogs.com/search/?q={quote_plus(genre)}&type=all\n"
+                parts.append(f"\n🎼 **{genre.title()} Specific Resources:**\n")
+                parts.append(f"**Reddit:** https://www.reddit.com/r/{genre.replace(' ', '')}music/\n")
+                parts.append(f"**Discogs:** https://www.discogs.com/search/?q={_quote_query(genre)}&type=all\n")
             
-            result_text += f"""
+            parts.append(f"""
 
 🔍 **Discovery Tools:**
 **Spotify Radio:** Create a radio station based on your preferences
@@ -579,10 +1087,11 @@ def register_music_tools(mcp):
 - Check out curated playlists on various platforms
 
 *🔴 Live search results from multiple music platforms*
-            """
+            """)
             
+            result_text = "".join(parts).strip()
             logger.info(f"get_music_recommendations tool output: {result_text[:200]}..." if len(result_text) > 200 else f"get_music_recommendations tool output: {result_text}")
-            return [TextContent(type="text", text=result_text.strip())]
+            return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
             logger.error(f"Error in get_music_recommendations: {e}")
@@ -607,58 +1116,52 @@ def register_music_tools(mcp):
     ) -> dict:
         """Search for a song and extract its audio stream information for music streaming."""
         try:
-            # Translate song name to English if needed
-            song_name_en = await translate_to_english(song_name, source_lang)
+            # Direct YouTube URLs are used as-is; anything else is translated and searched
+            prepared_query = YouTubeDownloader._prepare_query(song_name)
+            if prepared_query == song_name:
+                song_name_en = song_name
+            else:
+                song_name_en = await translate_to_english(song_name, source_lang)
+                prepared_query = YouTubeDownloader._prepare_query(song_name_en)
             logger.info(f"Searching for song: {song_name} (en: {song_name_en})")
             
             if not YouTubeDownloader.is_available():
                 return [TextContent(type="text", text="❌ **Error:** yt-dlp or ffmpeg not available. Please install required dependencies.")]
             
-            # Configure yt-dlp options
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'format': 'bestaudio/best',
-                'extractaudio': True,
-                'noplaylist': True,
-                'max_downloads': 1,
-                'default_search': f'ytsearch1:{song_name_en}'  # Direct search with limit
-            }
+            def _run():
+                return _get_ydl('stream', _STREAM_YDL_OPTS).extract_info(prepared_query, download=False)
             
             # Get video info and stream URL directly
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(f"ytsearch1:{song_name_en}", download=False)
-                
-                if not info or 'entries' not in info or not info['entries']:
-                    return [TextContent(
-                        type="text",
-                        text=f"❌ **Error:** No results found for: {song_name}"
-                    )]
-                
-                video_info = info['entries'][0]
-                video_url = video_info.get('webpage_url', '')
+            async with _YTDLP_SEM:
+                info = await asyncio.to_thread(_run)
             
-            # Extract the best audio format
-            formats = video_info.get('formats', [])
-            # First try to find audio-only formats
-            audio_formats = [f for f in formats if f.get('acodec') != 'none' and f.get('vcodec') == 'none']
+            # Search queries come back as a playlist, direct URLs as the video itself
+            if info and 'entries' in info:
+                info = info['entries'][0] if info['entries'] else None
+            if not info:
+                return [TextContent(
+                    type="text",
+                    text=f"❌ **Error:** No results found for: {song_name}"
+                )]
             
-            if not audio_formats:
-                # Fallback to any format with audio
-                audio_formats = [f for f in formats if f.get('acodec') != 'none']
+            video_info = info
+            video_url = video_info.get('webpage_url', '')
             
-            if not audio_formats:
+            # Extract the best audio format
+            # Prefer audio-only formats, falling back to any format with audio;
+            # "low" picks the smallest bitrate, "best"/"medium" the largest
+            best_audio = _pick_audio_format(
+                video_info.get('formats', []),
+                lowest=quality == "low",
+                prefer_audio_only=True
+            )
+            
+            if not best_audio:
                 return [TextContent(
                     type="text",
                     text=f"❌ **Error:** No audio streams found for: {song_name}"
                 )]
             
-            # Select the best quality based on preference
-            if quality == "low":
-                best_audio = min(audio_formats, key=lambda x: float(x.get('abr', 0) or 0))
-            else:  # "best" or "medium"
-                best_audio = max(audio_formats, key=lambda x: float(x.get('abr', 0) or 0))
-            
             # Get direct audio URL
             audio_url = best_audio.get('url', '')
             if not audio_url:
@@ -668,8 +1171,7 @@ def register_music_tools(mcp):
                 )]
 
             # Calculate duration string
-            duration = int(video_info.get('duration', 0))
-            duration_str = f"{duration // 60}:{duration % 60:02d}" if duration else "Unknown"
+            duration_str = _fmt_duration(video_info.get('duration'))
             
             # Get audio quality and format info
             audio_quality = best_audio.get('abr', 0)
@@ -719,7 +1221,7 @@ wget -O "audio.{audio_format}" "{audio_url}"
 
 *🔴 Live audio stream for "{song_name}"*
             """
-            print(result_text)  # For debugging
+            logger.debug("stream result:\n%s", result_text)
             logger.info(f"get_youtube_music_stream tool output: {result_text[:200]}..." if len(result_text) > 200 else f"get_youtube_music_stream tool output: {result_text}")
             return [TextContent(type="text", text=result_text.strip())]
             
@@ -741,12 +1243,18 @@ wget -O "audio.{audio_format}" "{audio_url}"
     @mcp.tool(description=SearchAndStreamMusicToolDescription.model_dump_json())
     async def search_and_stream_music(
         query: Annotated[str, Field(description="Search query for music (song name, artist, etc.)")],
-        include_streams: Annotated[bool, Field(description="Include stream URLs for top results", default=True)] = True
+        include_streams: Annotated[bool, Field(description="Include stream URLs for top results", default=True)] = True,
+        response_format: Annotated[Literal["markdown", "json", "both"], Field(description="Response format: 'markdown', 'json', or 'both'", default="markdown")] = "markdown"
     ) -> list[TextContent]:
         """Search for music on YouTube and get streaming information."""
         try:
             # Search YouTube
-            search_results = await MusicAPI.search_youtube_music_advanced(query)
+            ytdlp_available = YouTubeDownloader.is_available()
+            
+            # With streams wanted, one full extraction resolves formats alongside the search
+            search_results = await MusicAPI.search_youtube_music_advanced(
+                query, with_streams=include_streams and ytdlp_available
+            )
             
             if not search_results.get("success"):
                 return [TextContent(
@@ -762,66 +1270,82 @@ wget -O "audio.{audio_format}" "{audio_url}"
                     text=f"❌ **No results found for:** {query}"
                 )]
             
-            result_text = f"""
+            # Top 2 results that already carry a stream need no second extraction;
+            # only the rest are probed, concurrently
+            stream_infos = []
+            if include_streams and ytdlp_available:
+                top_tracks = results[:2]
+                to_probe = [track.get('url', '') for track in top_tracks if not track.get('audio_url')]
+                probed = iter(await MusicAPI.get_youtube_stream_info_batch(to_probe) if to_probe else [])
+                stream_infos = [
+                    {"success": True, **track} if track.get('audio_url') else next(probed)
+                    for track in top_tracks
+                ]
+                MusicAPI.prefetch_streams(
+                    [info.get('audio_url', '') for info in stream_infos if info.get('success')]
+                )
+            
+            search_method = search_results.get("method", "yt-dlp" if ytdlp_available else "fallback")
+            
+            json_content = None
+            if response_format in ("json", "both"):
+                payload = {"query": query, "method": search_method, "results": results}
+                if stream_infos:
+                    payload["streams"] = stream_infos
+                json_content = TextContent(type="text", text=orjson.dumps(payload, default=str).decode())
+                if response_format == "json":
+                    # Programmatic callers skip the markdown rendering entirely
+                    return [json_content]
+            
+            parts = [f"""
 **🎵 Music Search Results for "{query}"**
 
 **Found {len(results)} tracks:**
 
-"""
+"""]
+            
+            durations = [_fmt_duration(track.get('duration')) for track in results]
             
-            for i, track in enumerate(results, 1):
-                duration = int(track.get('duration', 0)) if track.get('duration') else 0
-                duration_str = f"{duration // 60}:{duration % 60:02d}" if duration else "Unknown"
+            for i, (track, duration_str) in enumerate(zip(results, durations), 1):
+                get = track.get
+                title = get('title', 'Unknown Title')
+                uploader = get('uploader', 'Unknown')
+                url = get('url', 'N/A')
                 
-                result_text += f"""
-**{i}. {track.get('title', 'Unknown Title')}**
-   🎤 **Artist/Channel:** {track.get('uploader', 'Unknown')}
+                parts.append(f"""
+**{i}. {title}**
+   🎤 **Artist/Channel:** {uploader}
    ⏱️ **Duration:** {duration_str}
-   🔗 **URL:** {track.get('url', 'N/A')}
-"""
+   🔗 **URL:** {url}
+""")
                 
                 # Add stream info for first 2 results if requested and yt-dlp is available
-                if include_streams and i <= 2 and YouTubeDownloader.is_available():
-                    stream_info = await MusicAPI.get_youtube_stream_info(track.get('url', ''))
+                if i <= len(stream_infos):
+                    stream_info = stream_infos[i - 1]
                     if stream_info.get("success"):
-                        result_text += f"   🎧 **Audio Quality:** {stream_info.get('quality', 'Unknown')} kbps\n"
-                        result_text += f"   📂 **Format:** {stream_info.get('format', 'Unknown')}\n"
+                        parts.append(f"   🎧 **Audio Quality:** {stream_info.get('quality', 'Unknown')} kbps\n")
+                        parts.append(f"   📂 **Format:** {stream_info.get('format', 'Unknown')}\n")
             
-            if include_streams and YouTubeDownloader.is_available():
-                result_text += f"""
-
-💡 **Streaming Tips:**
-- Use `get_youtube_music_stream` tool with any URL above for detailed stream info
-- Stream URLs are temporary and may expire
-- Best quality streams are automatically selected
-
-🛠️ **Available Tools:**
-- Use the URL with `get_youtube_music_stream` for direct audio streaming
-- All results support standard media players
-"""
-            elif include_streams and not YouTubeDownloader.is_available():
-                result_text += f"""
-
-⚠️ **Streaming Not Available:**
-Install `yt-dlp` and `ffmpeg` for audio streaming support:
-```bash
-pip install yt-dlp
-# Install ffmpeg for your OS
-```
-"""
+            if include_streams and ytdlp_available:
+                parts.append(STREAM_TIPS_TEXT)
+            elif include_streams and not ytdlp_available:
+                parts.append(STREAMING_UNAVAILABLE_TEXT)
             
-            search_method = search_results.get("method", "yt-dlp" if YouTubeDownloader.is_available() else "fallback")
-            result_text += f"\n*🔴 Live search results using {search_method}*"
+            parts.append(f"\n*🔴 Live search results using {search_method}*")
             
+            result_text = "".join(parts).strip()
             logger.info(f"search_and_stream_music tool output: {result_text[:200]}..." if len(result_text) > 200 else f"search_and_stream_music tool output: {result_text}")
-            return [TextContent(type="text", text=result_text.strip())]
+            contents = [TextContent(type="text", text=result_text)]
+            if json_content is not None:
+                contents.append(json_content)
+            return contents
             
         except Exception as e:
-            logger.error(f"Error in search_and_stream_music: {e}")
+            logger.error("Error in search_and_stream_music: %s", e)
             raise McpError(
                 ErrorData(
                     code=INTERNAL_ERROR,
-                    message=f"Error searching and streaming music: {str(e)}"
+                    message=f"Error searching and streaming music: {e}"
                 )
             )
 
@@ -840,116 +1364,63 @@ pip install yt-dlp
         try:
             # Check if yt-dlp is available
             if not YouTubeDownloader.is_available():
-                result_text = """
-❌ **Audio Download Not Available**
-
-**Required Dependencies Missing:**
-- `yt-dlp`: YouTube downloader library  
-- `ffmpeg`: Audio/video processing tool
-
-**Installation Instructions:**
-```bash
-# Install yt-dlp
-pip install yt-dlp
-
-# Install ffmpeg (Ubuntu/Debian)
-sudo apt install ffmpeg
-
-# Install ffmpeg (macOS)  
-brew install ffmpeg
-
-# Install ffmpeg (Windows)
-# Download from https://ffmpeg.org/download.html
-```
-
-**Note:** This tool downloads audio files locally. Make sure you have permission and comply with YouTube's Terms of Service.
-                """
-                return [TextContent(type="text", text=result_text.strip())]
-            
-            # Search for the song
-            search_results = await MusicAPI.search_youtube_music_advanced(song_name)
-            if not search_results.get("success") or not search_results.get("results"):
-                return [TextContent(
-                    type="text",
-                    text=f"❌ **Error:** No videos found for song: {song_name}"
-                )]
-
-            # Use the first search result
-            first_video = search_results["results"][0]
-            video_url = first_video.get("url", "")
+                return [TextContent(type="text", text=AUDIO_DOWNLOAD_UNAVAILABLE_TEXT)]
             
-            # Extract video ID from the search result URL
-            video_id = None
-            youtube_patterns = [
-                r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-                r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]+)',
-                r'(?:https?://)?(?:music\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)'
-            ]
+            result_text = await _download_song(song_name)
             
-            for pattern in youtube_patterns:
-                match = re.search(pattern, video_url)
-                if match:
-                    video_id = match.group(1)
-                    break
-                    
-            if not video_id:
-                return [TextContent(
-                    type="text",
-                    text="❌ **Error:** Could not extract a valid YouTube video ID from the search result."
-                )]
+            logger.info(f"download_youtube_audio tool output: {result_text[:200]}..." if len(result_text) > 200 else f"download_youtube_audio tool output: {result_text}")
+            return [TextContent(type="text", text=result_text)]
             
-            # Create temp directory for download
-            temp_dir = tempfile.mkdtemp()
+        except Exception as e:
+            logger.error("Error in download_youtube_audio: %s", e)
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Error downloading audio: {e}"
+                )
+            )
+
+    DownloadYouTubeAudiosToolDescription = RichToolDescription(
+        description="Search for several songs and download their audio in parallel.",
+        use_when="When you need to download audio for multiple songs from YouTube in one request.",
+        side_effects="Uses yt-dlp to download and convert YouTube videos to audio files concurrently, creates temporary files on disk.",
+    )
+
+    @mcp.tool(description=DownloadYouTubeAudiosToolDescription.model_dump_json())
+    async def download_youtube_audios(
+        song_names: Annotated[List[str], Field(description="Names of the songs to search for and download")]
+    ) -> list[TextContent]:
+        """Search for several songs and download their audio in parallel."""
+        try:
+            if not YouTubeDownloader.is_available():
+                return [TextContent(type="text", text=AUDIO_DOWNLOAD_UNAVAILABLE_TEXT)]
             
-            # Download audio
-            download_result = await YouTubeDownloader.download_audio(video_url, temp_dir)
+            # Drop duplicate names; concurrency is bounded by the yt-dlp semaphore
+            unique_names = list(dict.fromkeys(name.strip() for name in song_names if name.strip()))
+            if not unique_names:
+                return [TextContent(type="text", text="❌ **Error:** No song names provided")]
             
-            if not download_result.get("success"):
-                return [TextContent(
-                    type="text",
-                    text=f"❌ **Download failed:** {download_result.get('error', 'Unknown error')}"
-                )]
+            summaries = await asyncio.gather(
+                *(_download_song(name) for name in unique_names),
+                return_exceptions=True
+            )
             
-            file_path = download_result.get("file_path", "") 
-            file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+            parts = [f"**🎵 Batch Download: {len(unique_names)} songs**"]
+            for name, summary in zip(unique_names, summaries):
+                if isinstance(summary, Exception):
+                    logger.warning("Download failed for %s: %s", name, summary)
+                    summary = f"❌ **Download failed:** {summary}"
+                parts.append(f"### {name}\n\n{summary}")
             
-            result_text = f"""
-**✅ Audio Download Completed**
-
-📁 **File Information:**
-• **Title:** {download_result.get('title', 'Unknown')}
-• **Artist/Channel:** {download_result.get('uploader', 'Unknown')}
-• **File Path:** `{file_path}`
-• **File Size:** {file_size // (1024*1024):.1f} MB
-• **Format:** MP3
-• **Duration:** {int(download_result.get('duration', 0)) // 60}:{int(download_result.get('duration', 0)) % 60:02d}
-
-⚠️ **Important:**
-- File is saved in temporary directory: `{temp_dir}`
-- Move the file to desired location before system cleanup
-- Respect copyright and YouTube's Terms of Service
-- For personal use only
-
-🔧 **Next Steps:**
-```bash
-# Move file to your music directory
-mv "{file_path}" ~/Music/
-
-# Play the file
-mpv "{file_path}"
-```
-
-*🔴 Audio downloaded using yt-dlp and ffmpeg*
-            """
-            
-            logger.info(f"download_youtube_audio tool output: {result_text[:200]}..." if len(result_text) > 200 else f"download_youtube_audio tool output: {result_text}")
-            return [TextContent(type="text", text=result_text.strip())]
+            result_text = "\n\n---\n\n".join(parts)
+            logger.info(f"download_youtube_audios tool output: {result_text[:200]}..." if len(result_text) > 200 else f"download_youtube_audios tool output: {result_text}")
+            return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
-            logger.error(f"Error in download_youtube_audio: {e}")
+            logger.error("Error in download_youtube_audios: %s", e)
             raise McpError(
                 ErrorData(
                     code=INTERNAL_ERROR,
-                    message=f"Error downloading audio: {str(e)}"
+                    message=f"Error downloading audio: {e}"
                 )
             )
@@ -7,17 +7,166 @@ from pydantic import Field
 from mcp import ErrorData, McpError
 from mcp.types import INTERNAL_ERROR, TextContent
 import httpx
+import importlib.util
+import asyncio
 import json
+import orjson
 import re
+import string
+import time
 from datetime import datetime
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 import random
 import openai
 import logging
-from ..utils.helpers import translate_to_english
+import operator
+from ..utils.helpers import translate_to_english, TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Whole-response error markers erail returns instead of data
+_TRAIN_INFO_ERRORS = frozenset({
+    "~~~~~Please try again after some time.",
+    "~~~~~Train not found",
+})
+_BETWEEN_ERRORS = frozenset({
+    "~~~~~Please try again after some time.",
+    "~~~~~From station not found",
+    "~~~~~To station not found",
+})
+
+# Field names of a between-stations record, in the order erail sends them
+_BETWEEN_KEYS = (
+    "train_no", "train_name", "source_stn_name", "source_stn_code",
+    "dstn_stn_name", "dstn_stn_code", "from_stn_name", "from_stn_code",
+    "to_stn_name", "to_stn_code", "from_time", "to_time", "travel_time", "running_days"
+)
+
+# Route record fields we keep and the positions they're picked from
+_ROUTE_KEYS = ("source_stn_name", "source_stn_code", "arrive", "depart", "distance", "day", "zone")
+_route_values = operator.itemgetter(2, 1, 3, 4, 6, 7, 9)
+
+# Parsed responses by URL: schedules barely change, live boards and PNRs do
+_SCHEDULE_CACHE = TTLCache(maxsize=256, ttl=300)
+_LIVE_CACHE = TTLCache(maxsize=128, ttl=30)
+_PNR_CACHE = TTLCache(maxsize=128, ttl=10)
+
+# Pages bigger than this are parsed in a worker thread so they don't stall the event loop
+_PARSE_OFFLOAD_SIZE = 32 * 1024
+
+# httpx only speaks HTTP/2 with the optional h2 package installed
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Cap concurrent requests to the railway sites and retry responses that signal throttling or a transient failure
+_RAILWAY_SEM = asyncio.Semaphore(16)
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# In-flight fetches by URL, so concurrent identical lookups share one request
+_PENDING_FETCHES: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+# erail train number -> internal train ID used by the route endpoint
+_TRAIN_ID_CACHE: Dict[str, str] = {}
+
+# Elements carrying the "name" class on erail's station live page
+_NAME_CLASS_XPATH = etree.XPath('//*[contains(concat(" ", normalize-space(@class), " "), " name ")]')
+
+# Start of the PNR JSON assigned in confirmtkt's page script
+_PNR_DATA_RE = re.compile(r'data\s*=\s*(\{)')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _fields(text: str, sep: str, n: int) -> List[str]:
+    """Split text on sep, dropping empty fields and padding with "" to at least n fields."""
+    parts = [part for part in text.split(sep) if part]
+    if len(parts) < n:
+        parts.extend([""] * (n - len(parts)))
+    return parts
+
+
+TRAIN_STATUS_TMPL = """
+**🚂 Train Status for {train_number}**
+
+📋 **Train Details:**
+• **Name:** {train_name}
+• **Number:** {train_no}
+• **Type:** {type}
+
+🛤️ **Route Information:**
+• **From:** {from_stn_name} ({from_stn_code})
+• **To:** {to_stn_name} ({to_stn_code})
+• **Distance:** {distance_from_to} km
+• **Average Speed:** {average_speed} km/h
+
+⏰ **Timing:**
+• **Departure:** {from_time}
+• **Arrival:** {to_time}
+• **Travel Time:** {travel_time}
+
+📅 **Running Days:** {running_days}
+
+📍 **Date:** {date}
+
+*Last Updated: {last_updated}*
+"""
+
+PNR_STATUS_TMPL = """
+**🎫 PNR Status for {pnr_number}**
+
+📋 **Booking Details:**
+• **PNR:** {pnr}
+• **Train:** {train_name}
+• **Journey Date:** {journey_date}
+• **From:** {from}
+• **To:** {to}
+
+👥 **Passenger Details:**
+"""
+
+BETWEEN_TRAIN_TMPL = """
+**{i}. {train_name} ({train_no})**
+🛤️ **Route:** {source_stn_name} ({source_stn_code}) → {dstn_stn_name} ({dstn_stn_code})
+📍 **Journey:** {from_stn_name} ({from_stn_code}) → {to_stn_name} ({to_stn_code})
+🕐 **Timing:** {from_time} → {to_time}
+⏱️ **Duration:** {travel_time}
+📅 **Runs:** {running_days}
+"""
+
+PNR_PASSENGER_TMPL = """
+**{i}. {name}**
+   • Age: {age} | Gender: {gender}
+   • Current Status: {current_status}
+   • Booking Status: {booking_status}
+"""
+
+SCHEDULE_STOP_TMPL = """
+**{i}. {source_stn_name} ({source_stn_code})**
+   📍 Distance: {distance} km
+   🕐 Arrival: {arrival} | Departure: {departure}
+   📅 Day: {day} | Zone: {zone}
+"""
+
+STATION_TRAIN_TMPL = """
+**{i}. {train_name} ({train_no})**
+   🛤️ Route: {source_stn_name} → {dstn_stn_name}
+   🕐 Time: {time_at}
+   📝 Status: {detail}
+"""
+
+
+def _na_defaults(template: str) -> Dict[str, str]:
+    """Map every field of template to "N/A", for filling fields a record doesn't have."""
+    return dict.fromkeys((name for _, name, _, _ in string.Formatter().parse(template) if name), "N/A")
+
+
+# Merged under each record so templates can be filled with a single format_map
+_TRAIN_STATUS_DEFAULTS = _na_defaults(TRAIN_STATUS_TMPL)
+_PNR_STATUS_DEFAULTS = _na_defaults(PNR_STATUS_TMPL)
+_BETWEEN_TRAIN_DEFAULTS = _na_defaults(BETWEEN_TRAIN_TMPL)
+_PNR_PASSENGER_DEFAULTS = _na_defaults(PNR_PASSENGER_TMPL)
+_SCHEDULE_STOP_DEFAULTS = _na_defaults(SCHEDULE_STOP_TMPL)
+_STATION_TRAIN_DEFAULTS = _na_defaults(STATION_TRAIN_TMPL)
+
 
 class RichToolDescription(openai.BaseModel):
     """Rich tool description model for MCP server compatibility."""
@@ -40,61 +189,139 @@ class RailwayAPI:
     def get_random_user_agent(cls) -> str:
         return random.choice(cls.USER_AGENTS)
     
+    # Shared client so repeat lookups reuse keep-alive connections
+    _client: Optional[httpx.AsyncClient] = None
+    _client_lock = asyncio.Lock()
+    
+    @classmethod
+    async def _get_client(cls) -> httpx.AsyncClient:
+        """Get the shared railway client, creating it on first use."""
+        if cls._client is None or cls._client.is_closed:
+            async with cls._client_lock:
+                if cls._client is None or cls._client.is_closed:
+                    # One user agent per client, sent as a default header on every request
+                    cls._client = httpx.AsyncClient(
+                        http2=_HTTP2_AVAILABLE,
+                        timeout=30,
+                        headers={"User-Agent": cls.get_random_user_agent()},
+                        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+                    )
+        return cls._client
+    
+    @classmethod
+    async def _fetch_parsed(cls, url: str, parser, cache: TTLCache, incremental: bool = False) -> Dict[str, Any]:
+        """Fetch and parse url, serving successful results from cache and coalescing concurrent misses"""
+        cached = cache.get(url)
+        if cached is not None:
+            logger.debug("Railway cache hit: %s", url)
+            return cached
+        
+        pending = _PENDING_FETCHES.get(url)
+        if pending is None:
+            pending = asyncio.ensure_future(cls._fetch_and_parse(url, parser, cache, incremental))
+            _PENDING_FETCHES[url] = pending
+            pending.add_done_callback(lambda _: _PENDING_FETCHES.pop(url, None))
+        return await asyncio.shield(pending)
+    
+    @classmethod
+    async def _fetch_and_parse(cls, url: str, parser, cache: TTLCache, incremental: bool = False) -> Dict[str, Any]:
+        """GET url on the shared client and parse it, caching the result if parsing succeeded
+        
+        With incremental, the body is fed to lxml as it arrives and parser gets the HTML tree.
+        """
+        page, size = await cls._download(url, incremental)
+        result = await cls._run_parser(parser, page, size)
+        if result.get("success"):
+            cache.set(url, result)
+        return result
+    
+    @classmethod
+    async def _download(cls, url: str, incremental: bool, attempts: int = 3):
+        """Download url as text, or as an lxml tree with incremental, retrying throttling, 5xx and network errors"""
+        client = await cls._get_client()
+        for attempt in range(attempts):
+            try:
+                async with _RAILWAY_SEM:
+                    if not incremental:
+                        response = await client.get(url)
+                        response.raise_for_status()
+                        text = response.text
+                        return text, len(text)
+                    
+                    async with client.stream("GET", url) as response:
+                        response.raise_for_status()
+                        # Never buffer or decode the whole body; lxml builds the tree chunk by chunk
+                        html_parser = lxml.html.HTMLParser(encoding=response.encoding)
+                        size = 0
+                        async for chunk in response.aiter_bytes():
+                            html_parser.feed(chunk)
+                            size += len(chunk)
+                    try:
+                        return html_parser.close(), size
+                    except etree.XMLSyntaxError:
+                        # Empty or whitespace-only page: parse it as an empty document
+                        return lxml.html.Element("html"), size
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in _RETRY_STATUSES or attempt == attempts - 1:
+                    raise
+                logger.debug("Retrying %s after HTTP %s", url, e.response.status_code)
+            except httpx.TransportError as e:
+                if attempt == attempts - 1:
+                    raise
+                logger.debug("Retrying %s after %s", url, e)
+            # 0.2s, 0.4s, ... outside the semaphore so waiting retries don't hold a slot
+            await asyncio.sleep(0.2 * 2 ** attempt)
+    
+    @staticmethod
+    async def _run_parser(parser, page: Any, size: int) -> Dict[str, Any]:
+        """Run parser on page, off the event loop thread when the page is large"""
+        if size > _PARSE_OFFLOAD_SIZE:
+            return await asyncio.to_thread(parser, page)
+        return parser(page)
+    
     @classmethod
     async def get_train_info(cls, train_no: str) -> Dict[str, Any]:
         """Get train information by train number"""
         url = f"{cls.BASE_URL}/rail/getTrains.aspx?TrainNo={train_no}&DataSource=0&Language=0&Cache=true"
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": cls.get_random_user_agent()},
-                    timeout=30
-                )
-                response.raise_for_status()
-                return cls._parse_train_info(response.text)
-            except Exception as e:
-                raise McpError(
-                    ErrorData(
-                        code=INTERNAL_ERROR,
-                        message=f"Error fetching train info: {str(e)}"
-                    )
+        try:
+            return await cls._fetch_parsed(url, cls._parse_train_info, _SCHEDULE_CACHE)
+        except Exception as e:
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Error fetching train info: {str(e)}"
                 )
+            )
 
     @classmethod
-    async def _translate_station_name(cls, station_name: str) -> str:
+    async def _translate_station_name(cls, station_name: str, source_lang: str = "auto") -> str:
         """Translate station name to English if needed"""
-        return await translate_to_english(station_name)
+        return await translate_to_english(station_name, source_lang)
 
     @classmethod
-    async def get_trains_between_stations(cls, from_station: str, to_station: str) -> Dict[str, Any]:
+    async def get_trains_between_stations(cls, from_station: str, to_station: str, source_lang: str = "auto") -> Dict[str, Any]:
         """Get trains between two stations"""
         try:
-            # Translate station names if needed
-            from_station_en = await cls._translate_station_name(from_station)
-            to_station_en = await cls._translate_station_name(to_station)
+            # Translate both station names concurrently if needed
+            from_station_en, to_station_en = await asyncio.gather(
+                cls._translate_station_name(from_station, source_lang),
+                cls._translate_station_name(to_station, source_lang)
+            )
             
             url = f"{cls.BASE_URL}/rail/getTrains.aspx?Station_From={from_station_en}&Station_To={to_station_en}&DataSource=0&Language=0&Cache=true"
             
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.get(
-                        url,
-                        headers={"User-Agent": cls.get_random_user_agent()},
-                        timeout=30
-                    )
-                    response.raise_for_status()
-                    return cls._parse_between_stations(response.text)
-                except Exception as e:
-                    raise McpError(
-                        ErrorData(
-                            code=INTERNAL_ERROR,
-                            message=f"Error fetching trains between stations: {str(e)}"
-                        )
+            try:
+                return await cls._fetch_parsed(url, cls._parse_between_stations, _SCHEDULE_CACHE)
+            except Exception as e:
+                raise McpError(
+                    ErrorData(
+                        code=INTERNAL_ERROR,
+                        message=f"Error fetching trains between stations: {str(e)}"
                     )
+                )
         except Exception as e:
-            logger.error(f"Error in get_trains_between_stations: {e}")
+            logger.error("Error in get_trains_between_stations: %s", e)
             raise McpError(
                 ErrorData(
                     code=INTERNAL_ERROR,
@@ -105,93 +332,75 @@ class RailwayAPI:
     @classmethod
     async def get_train_route(cls, train_no: str) -> Dict[str, Any]:
         """Get complete route of a train"""
-        # First get train info to get train_id
-        train_info = await cls.get_train_info(train_no)
-        if not train_info.get("success"):
-            return train_info
-        
-        train_id = train_info["data"].get("train_id")
+        # Train IDs don't change, so only look one up the first time a train is routed
+        train_id = _TRAIN_ID_CACHE.get(train_no)
         if not train_id:
-            return {"success": False, "data": "Train ID not found"}
+            train_info = await cls.get_train_info(train_no)
+            if not train_info.get("success"):
+                return train_info
+            
+            train_id = train_info["data"].get("train_id")
+            if not train_id:
+                return {"success": False, "data": "Train ID not found"}
+            _TRAIN_ID_CACHE[train_no] = train_id
         
         url = f"{cls.BASE_URL}/data.aspx?Action=TRAINROUTE&Password=2012&Data1={train_id}&Data2=0&Cache=true"
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": cls.get_random_user_agent()},
-                    timeout=30
-                )
-                response.raise_for_status()
-                return cls._parse_train_route(response.text)
-            except Exception as e:
-                raise McpError(
-                    ErrorData(
-                        code=INTERNAL_ERROR,
-                        message=f"Error fetching train route: {str(e)}"
-                    )
+        try:
+            return await cls._fetch_parsed(url, cls._parse_train_route, _SCHEDULE_CACHE)
+        except Exception as e:
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Error fetching train route: {str(e)}"
                 )
+            )
     
     @classmethod
     async def get_station_live_status(cls, station_code: str) -> Dict[str, Any]:
         """Get live status of trains at a station"""
         url = f"{cls.BASE_URL}/station-live/{station_code}?DataSource=0&Language=0&Cache=true"
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": cls.get_random_user_agent()},
-                    timeout=30
-                )
-                response.raise_for_status()
-                return cls._parse_station_live(response.text)
-            except Exception as e:
-                raise McpError(
-                    ErrorData(
-                        code=INTERNAL_ERROR,
-                        message=f"Error fetching station live status: {str(e)}"
-                    )
+        try:
+            return await cls._fetch_parsed(url, cls._parse_station_live, _LIVE_CACHE, incremental=True)
+        except Exception as e:
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Error fetching station live status: {str(e)}"
                 )
+            )
     
     @classmethod
     async def get_pnr_status(cls, pnr_number: str) -> Dict[str, Any]:
         """Get PNR status"""
         url = f"https://www.confirmtkt.com/pnr-status/{pnr_number}"
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": cls.get_random_user_agent()},
-                    timeout=30
-                )
-                response.raise_for_status()
-                return cls._parse_pnr_status(response.text)
-            except Exception as e:
-                logger.error(f"Error in get_pnr_status: {e}")
-                raise McpError(
-                    ErrorData(
-                        code=INTERNAL_ERROR,
-                        message=f"Error fetching PNR status: {str(e)}"
-                    )
+        try:
+            return await cls._fetch_parsed(url, cls._parse_pnr_status, _PNR_CACHE)
+        except Exception as e:
+            logger.error("Error in get_pnr_status: %s", e)
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Error fetching PNR status: {str(e)}"
                 )
+            )
     
     @classmethod
     def _parse_train_info(cls, html_text: str) -> Dict[str, Any]:
         """Parse train information from HTML response"""
+        now_ms = time.time_ns() // 1_000_000
         try:
-            retval = {"success": True, "time_stamp": int(datetime.now().timestamp() * 1000), "data": {}}
+            retval = {"success": True, "time_stamp": now_ms, "data": {}}
             
             data = html_text.split("~~~~~~~~")
             
             # Check for errors
-            if (data[0] == "~~~~~Please try again after some time." or 
-                data[0] == "~~~~~Train not found"):
+            if data[0] in _TRAIN_INFO_ERRORS:
                 return {
                     "success": False,
-                    "time_stamp": int(datetime.now().timestamp() * 1000),
+                    "time_stamp": now_ms,
                     "data": data[0].replace("~", "")
                 }
             
@@ -213,12 +422,12 @@ class RailwayAPI:
             }
             
             if len(data) > 1:
-                data2 = [item for item in data[1].split("~") if item]
+                data2 = _fields(data[1], "~", 20)
                 obj.update({
-                    "type": data2[11] if len(data2) > 11 else "",
-                    "train_id": data2[12] if len(data2) > 12 else "",
-                    "distance_from_to": data2[18] if len(data2) > 18 else "",
-                    "average_speed": data2[19] if len(data2) > 19 else ""
+                    "type": data2[11],
+                    "train_id": data2[12],
+                    "distance_from_to": data2[18],
+                    "average_speed": data2[19]
                 })
             
             retval["data"] = obj
@@ -227,15 +436,16 @@ class RailwayAPI:
         except Exception as e:
             return {
                 "success": False,
-                "time_stamp": int(datetime.now().timestamp() * 1000),
+                "time_stamp": now_ms,
                 "data": f"Error parsing train info: {str(e)}"
             }
     
     @classmethod
     def _parse_between_stations(cls, html_text: str) -> Dict[str, Any]:
         """Parse trains between stations from HTML response"""
+        now_ms = time.time_ns() // 1_000_000
         try:
-            retval = {"success": True, "time_stamp": int(datetime.now().timestamp() * 1000), "data": []}
+            retval = {"success": True, "time_stamp": now_ms, "data": []}
             
             data = html_text.split("~~~~~~~~")
             
@@ -246,21 +456,15 @@ class RailwayAPI:
                 if nore[0] == "No direct trains found":
                     return {
                         "success": False,
-                        "time_stamp": int(datetime.now().timestamp() * 1000),
+                        "time_stamp": now_ms,
                         "data": nore[0]
                     }
             
             # Check for other errors
-            error_messages = [
-                "~~~~~Please try again after some time.",
-                "~~~~~From station not found",
-                "~~~~~To station not found"
-            ]
-            
-            if data[0] in error_messages:
+            if data[0] in _BETWEEN_ERRORS:
                 return {
                     "success": False,
-                    "time_stamp": int(datetime.now().timestamp() * 1000),
+                    "time_stamp": now_ms,
                     "data": data[0].replace("~", "")
                 }
             
@@ -272,23 +476,7 @@ class RailwayAPI:
                 if len(data1) == 2:
                     data1 = [d for d in data1[1].split("~") if d]
                     if len(data1) >= 14:
-                        obj = {
-                            "train_no": data1[0],
-                            "train_name": data1[1],
-                            "source_stn_name": data1[2],
-                            "source_stn_code": data1[3],
-                            "dstn_stn_name": data1[4],
-                            "dstn_stn_code": data1[5],
-                            "from_stn_name": data1[6],
-                            "from_stn_code": data1[7],
-                            "to_stn_name": data1[8],
-                            "to_stn_code": data1[9],
-                            "from_time": data1[10],
-                            "to_time": data1[11],
-                            "travel_time": data1[12],
-                            "running_days": data1[13]
-                        }
-                        arr.append({"train_base": obj})
+                        arr.append({"train_base": dict(zip(_BETWEEN_KEYS, data1))})
             
             retval["data"] = arr
             return retval
@@ -296,15 +484,16 @@ class RailwayAPI:
         except Exception as e:
             return {
                 "success": False,
-                "time_stamp": int(datetime.now().timestamp() * 1000),
+                "time_stamp": now_ms,
                 "data": f"Error parsing between stations: {str(e)}"
             }
     
     @classmethod
     def _parse_train_route(cls, html_text: str) -> Dict[str, Any]:
         """Parse train route from HTML response"""
+        now_ms = time.time_ns() // 1_000_000
         try:
-            retval = {"success": True, "time_stamp": int(datetime.now().timestamp() * 1000), "data": []}
+            retval = {"success": True, "time_stamp": now_ms, "data": []}
             
             data = html_text.split("~^")
             arr = []
@@ -312,16 +501,7 @@ class RailwayAPI:
             for item in data:
                 data1 = [d for d in item.split("~") if d]
                 if len(data1) >= 10:
-                    obj = {
-                        "source_stn_name": data1[2] if len(data1) > 2 else "",
-                        "source_stn_code": data1[1] if len(data1) > 1 else "",
-                        "arrive": data1[3] if len(data1) > 3 else "",
-                        "depart": data1[4] if len(data1) > 4 else "",
-                        "distance": data1[6] if len(data1) > 6 else "",
-                        "day": data1[7] if len(data1) > 7 else "",
-                        "zone": data1[9] if len(data1) > 9 else ""
-                    }
-                    arr.append(obj)
+                    arr.append(dict(zip(_ROUTE_KEYS, _route_values(data1))))
             
             retval["data"] = arr
             return retval
@@ -329,28 +509,27 @@ class RailwayAPI:
         except Exception as e:
             return {
                 "success": False,
-                "time_stamp": int(datetime.now().timestamp() * 1000),
+                "time_stamp": now_ms,
                 "data": f"Error parsing train route: {str(e)}"
             }
     
     @classmethod
-    def _parse_station_live(cls, html_text: str) -> Dict[str, Any]:
-        """Parse station live status from HTML response"""
+    def _parse_station_live(cls, root: "lxml.html.HtmlElement") -> Dict[str, Any]:
+        """Parse station live status from the parsed HTML page"""
+        now_ms = time.time_ns() // 1_000_000
         try:
-            retval = {"success": True, "time_stamp": int(datetime.now().timestamp() * 1000), "data": []}
+            retval = {"success": True, "time_stamp": now_ms, "data": []}
             
-            soup = BeautifulSoup(html_text, 'html.parser')
             arr = []
             
-            name_elements = soup.find_all(class_='name')
-            for el in name_elements:
-                text = el.get_text().strip()
+            for el in _NAME_CLASS_XPATH(root):
+                text = el.text_content().strip()
                 if len(text) >= 5:
                     train_no = text[:5]
                     train_name = text[5:].strip()
                     
-                    next_div = el.find_next_sibling('div')
-                    route_text = next_div.get_text().strip() if next_div else ""
+                    next_div = next(el.itersiblings('div'), None)
+                    route_text = next_div.text_content().strip() if next_div is not None else ""
                     
                     source_stn = ""
                     dstn_stn = ""
@@ -360,9 +539,9 @@ class RailwayAPI:
                         dstn_stn = parts[1].strip() if len(parts) > 1 else ""
                     
                     # Get timing info
-                    td_parent = el.find_parent('td')
-                    next_td = td_parent.find_next_sibling('td') if td_parent else None
-                    timing_text = next_td.get_text().strip() if next_td else ""
+                    td_parent = next(el.iterancestors('td'), None)
+                    next_td = next(td_parent.itersiblings('td'), None) if td_parent is not None else None
+                    timing_text = next_td.text_content().strip() if next_td is not None else ""
                     
                     time_at = timing_text[:5] if len(timing_text) >= 5 else ""
                     detail = timing_text[5:].strip() if len(timing_text) > 5 else ""
@@ -383,33 +562,38 @@ class RailwayAPI:
         except Exception as e:
             return {
                 "success": False,
-                "time_stamp": int(datetime.now().timestamp() * 1000),
+                "time_stamp": now_ms,
                 "data": f"Error parsing station live status: {str(e)}"
             }
     
     @classmethod
     def _parse_pnr_status(cls, html_text: str) -> Dict[str, Any]:
         """Parse PNR status from HTML response"""
+        now_ms = time.time_ns() // 1_000_000
         try:
-            retval = {"success": True, "time_stamp": int(datetime.now().timestamp() * 1000), "data": {}}
+            retval = {"success": True, "time_stamp": now_ms, "data": {}}
             
             # Look for data pattern in JavaScript
-            pattern = r'data\s*=\s*({.*?;)'
-            match = re.search(pattern, html_text)
+            match = _PNR_DATA_RE.search(html_text)
             
             if match:
-                json_str = match.group(0)[7:-1]  # Remove 'data = ' and trailing ';'
+                start = match.start(1)
+                end = html_text.find("};", start)
+                try:
+                    # The object normally ends at the first "};", which orjson parses fastest
+                    data = orjson.loads(html_text[start:end + 1]) if end != -1 else None
+                except orjson.JSONDecodeError:
+                    data = None
                 try:
-                    data = json.loads(json_str)
+                    if data is None:
+                        # "};" inside a string value; decode from the page up to the object's real end
+                        data, _ = _JSON_DECODER.raw_decode(html_text, start)
                     retval["data"] = data
                     return retval
                 except json.JSONDecodeError:
                     pass
             
-            # Fallback: try to extract basic PNR info from HTML
-            soup = BeautifulSoup(html_text, 'html.parser')
-            
-            # This is a simplified extraction - the actual website structure may vary
+            # Fallback when the page has no usable data object
             pnr_info = {
                 "pnr": "N/A",
                 "train_name": "N/A",
@@ -425,11 +609,18 @@ class RailwayAPI:
         except Exception as e:
             return {
                 "success": False,
-                "time_stamp": int(datetime.now().timestamp() * 1000),
+                "time_stamp": now_ms,
                 "data": f"Error parsing PNR status: {str(e)}"
             }
 
 
+async def close_railway_client() -> None:
+    """Close the shared railway client."""
+    if RailwayAPI._client is not None:
+        await RailwayAPI._client.aclose()
+        RailwayAPI._client = None
+
+
 def register_railway_tools(mcp):
     """Register railway-related tools with the MCP server."""
     
@@ -447,7 +638,7 @@ def register_railway_tools(mcp):
         date: Annotated[str, Field(description="Date in YYYY-MM-DD format", default="")] = ""
     ) -> list[TextContent]:
         """Get live status and detailed information of a train."""
-        logger.info(f"get_live_train_status tool called with train_number={train_number}")
+        logger.info("get_live_train_status tool called with train_number=%s", train_number)
         try:
             if not date:
                 date = datetime.now().strftime("%Y-%m-%d")
@@ -463,37 +654,20 @@ def register_railway_tools(mcp):
             
             data = train_info["data"]
             
-            result_text = f"""
-**🚂 Train Status for {train_number}**
-
-📋 **Train Details:**
-• **Name:** {data.get('train_name', 'N/A')}
-• **Number:** {data.get('train_no', train_number)}
-• **Type:** {data.get('type', 'N/A')}
-
-🛤️ **Route Information:**
-• **From:** {data.get('from_stn_name', 'N/A')} ({data.get('from_stn_code', 'N/A')})
-• **To:** {data.get('to_stn_name', 'N/A')} ({data.get('to_stn_code', 'N/A')})
-• **Distance:** {data.get('distance_from_to', 'N/A')} km
-• **Average Speed:** {data.get('average_speed', 'N/A')} km/h
-
-⏰ **Timing:**
-• **Departure:** {data.get('from_time', 'N/A')}
-• **Arrival:** {data.get('to_time', 'N/A')}
-• **Travel Time:** {data.get('travel_time', 'N/A')}
-
-📅 **Running Days:** {data.get('running_days', 'N/A')}
-
-📍 **Date:** {date}
-
-*Last Updated: {datetime.fromtimestamp(train_info.get('time_stamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S')}*
-            """
+            result_text = TRAIN_STATUS_TMPL.format_map({
+                **_TRAIN_STATUS_DEFAULTS,
+                "train_no": train_number,
+                **data,
+                "train_number": train_number,
+                "date": date,
+                "last_updated": datetime.fromtimestamp(train_info.get('time_stamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S'),
+            })
             
-            logger.info(f"get_live_train_status tool output: {result_text.strip()[:200]}..." if len(result_text.strip()) > 200 else f"get_live_train_status tool output: {result_text.strip()}")
+            logger.info("get_live_train_status tool output: %.200s%s", result_text.strip(), "..." if len(result_text.strip()) > 200 else "")
             return [TextContent(type="text", text=result_text.strip())]
             
         except Exception as e:
-            logger.error(f"Error in get_live_train_status: {e}")
+            logger.error("Error in get_live_train_status: %s", e)
             raise McpError(
                 ErrorData(
                     code=INTERNAL_ERROR,
@@ -515,9 +689,9 @@ def register_railway_tools(mcp):
         date: Annotated[str, Field(description="Date in DD-MM-YYYY format for filtering trains", default="")] = ""
     ) -> List[TextContent]:
         """Get trains between two stations."""
-        logger.info(f"get_trains_between_stations tool called with from_station={from_station}, to_station={to_station}")
+        logger.info("get_trains_between_stations tool called with from_station=%s, to_station=%s", from_station, to_station)
         try:
-            logger.info(f"Getting trains between {from_station} and {to_station}")
+            logger.info("Getting trains between %s and %s", from_station, to_station)
             # Get trains between stations
             trains_data = await RailwayAPI.get_trains_between_stations(from_station, to_station, source_lang)
             
@@ -535,32 +709,26 @@ def register_railway_tools(mcp):
                     text=f"❌ **No trains found between {from_station} and {to_station}**"
                 )]
             
-            result_text = f"""
+            parts = [f"""
 **🚂 Trains from {from_station} to {to_station}**
 {f"📅 **Date Filter:** {date}" if date else ""}
 
 **Found {len(trains)} trains:**
 
-"""
+"""]
             
             for i, train_data in enumerate(trains, 1):
                 train = train_data.get("train_base", {})
-                result_text += f"""
-**{i}. {train.get('train_name', 'N/A')} ({train.get('train_no', 'N/A')})**
-🛤️ **Route:** {train.get('source_stn_name', 'N/A')} ({train.get('source_stn_code', 'N/A')}) → {train.get('dstn_stn_name', 'N/A')} ({train.get('dstn_stn_code', 'N/A')})
-📍 **Journey:** {train.get('from_stn_name', 'N/A')} ({train.get('from_stn_code', 'N/A')}) → {train.get('to_stn_name', 'N/A')} ({train.get('to_stn_code', 'N/A')})
-🕐 **Timing:** {train.get('from_time', 'N/A')} → {train.get('to_time', 'N/A')}
-⏱️ **Duration:** {train.get('travel_time', 'N/A')}
-📅 **Runs:** {train.get('running_days', 'N/A')}
-"""
+                parts.append(BETWEEN_TRAIN_TMPL.format_map({**_BETWEEN_TRAIN_DEFAULTS, **train, "i": i}))
             
-            result_text += f"\n*Last Updated: {datetime.fromtimestamp(trains_data.get('time_stamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S')}*"
+            parts.append(f"\n*Last Updated: {datetime.fromtimestamp(trains_data.get('time_stamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S')}*")
             
-            logger.info(f"get_trains_between_stations tool output: {result_text.strip()[:200]}..." if len(result_text.strip()) > 200 else f"get_trains_between_stations tool output: {result_text.strip()}")
-            return [TextContent(type="text", text=result_text.strip())]
+            result_text = "".join(parts).strip()
+            logger.info("get_trains_between_stations tool output: %.200s%s", result_text, "..." if len(result_text) > 200 else "")
+            return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
-            logger.error(f"Error in get_trains_between_stations: {e}")
+            logger.error("Error in get_trains_between_stations: %s", e)
             raise McpError(
                 ErrorData(
                     code=INTERNAL_ERROR,
@@ -579,9 +747,9 @@ def register_railway_tools(mcp):
         pnr_number: Annotated[str, Field(description="10-digit PNR number")]
     ) -> list[TextContent]:
         """Check PNR status for a railway booking."""
-        logger.info(f"get_pnr_status_tool called with pnr_number={pnr_number}")
+        logger.info("get_pnr_status_tool called with pnr_number=%s", pnr_number)
         try:
-            logger.info(f"Checking PNR status for: {pnr_number}")
+            logger.info("Checking PNR status for: %s", pnr_number)
             if len(pnr_number) != 10 or not pnr_number.isdigit():
                 raise McpError(
                     ErrorData(
@@ -601,40 +769,35 @@ def register_railway_tools(mcp):
             
             data = pnr_data["data"]
             
-            result_text = f"""
-**🎫 PNR Status for {pnr_number}**
-
-📋 **Booking Details:**
-• **PNR:** {data.get('pnr', pnr_number)}
-• **Train:** {data.get('train_name', 'N/A')}
-• **Journey Date:** {data.get('journey_date', 'N/A')}
-• **From:** {data.get('from', 'N/A')}
-• **To:** {data.get('to', 'N/A')}
-
-👥 **Passenger Details:**
-"""
+            parts = [PNR_STATUS_TMPL.format_map({
+                **_PNR_STATUS_DEFAULTS,
+                "pnr": pnr_number,
+                **data,
+                "pnr_number": pnr_number,
+            })]
             
             passengers = data.get('passengers', [])
             if passengers:
                 for i, passenger in enumerate(passengers, 1):
-                    result_text += f"""
-**{i}. {passenger.get('name', 'Passenger ' + str(i))}**
-   • Age: {passenger.get('age', 'N/A')} | Gender: {passenger.get('gender', 'N/A')}
-   • Current Status: {passenger.get('current_status', 'N/A')}
-   • Booking Status: {passenger.get('booking_status', 'N/A')}
-"""
+                    parts.append(PNR_PASSENGER_TMPL.format_map({
+                        **_PNR_PASSENGER_DEFAULTS,
+                        "name": f"Passenger {i}",
+                        **passenger,
+                        "i": i,
+                    }))
             else:
-                result_text += "\n*Passenger details not available*"
+                parts.append("\n*Passenger details not available*")
             
-            result_text += f"\n*Last Updated: {datetime.fromtimestamp(pnr_data.get('time_stamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S')}*"
+            parts.append(f"\n*Last Updated: {datetime.fromtimestamp(pnr_data.get('time_stamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S')}*")
             
-            logger.info(f"get_pnr_status_tool output: {result_text.strip()[:200]}..." if len(result_text.strip()) > 200 else f"get_pnr_status_tool output: {result_text.strip()}")
-            return [TextContent(type="text", text=result_text.strip())]
+            result_text = "".join(parts).strip()
+            logger.info("get_pnr_status_tool output: %.200s%s", result_text, "..." if len(result_text) > 200 else "")
+            return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
             if isinstance(e, McpError):
                 raise
-            logger.error(f"Error in get_pnr_status_tool: {e}")
+            logger.error("Error in get_pnr_status_tool: %s", e)
             raise McpError(
                 ErrorData(
                     code=INTERNAL_ERROR,
@@ -653,9 +816,9 @@ def register_railway_tools(mcp):
         train_number: Annotated[str, Field(description="Train number (e.g., 12345)")]
     ) -> list[TextContent]:
         """Get complete schedule/route for a train with all stations."""
-        logger.info(f"get_train_schedule_tool called with train_number={train_number}")
+        logger.info("get_train_schedule_tool called with train_number=%s", train_number)
         try:
-            logger.info(f"Getting train schedule for train {train_number}")
+            logger.info("Getting train schedule for train %s", train_number)
             # Get train route
             route_data = await RailwayAPI.get_train_route(train_number)
             
@@ -673,31 +836,33 @@ def register_railway_tools(mcp):
                     text=f"❌ **No route information found for train {train_number}**"
                 )]
             
-            result_text = f"""
+            parts = [f"""
 **🚂 Complete Schedule for Train {train_number}**
 
 **📍 Route with {len(stations)} stations:**
 
-"""
+"""]
             
             for i, station in enumerate(stations, 1):
                 arrival = station.get('arrive', 'Start') if station.get('arrive') != '00:00' else 'Start'
                 departure = station.get('depart', 'End') if station.get('depart') != '00:00' else 'End'
                 
-                result_text += f"""
-**{i}. {station.get('source_stn_name', 'N/A')} ({station.get('source_stn_code', 'N/A')})**
-   📍 Distance: {station.get('distance', 'N/A')} km
-   🕐 Arrival: {arrival} | Departure: {departure}
-   📅 Day: {station.get('day', 'N/A')} | Zone: {station.get('zone', 'N/A')}
-"""
+                parts.append(SCHEDULE_STOP_TMPL.format_map({
+                    **_SCHEDULE_STOP_DEFAULTS,
+                    **station,
+                    "i": i,
+                    "arrival": arrival,
+                    "departure": departure,
+                }))
             
-            result_text += f"\n*Last Updated: {datetime.fromtimestamp(route_data.get('time_stamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S')}*"
+            parts.append(f"\n*Last Updated: {datetime.fromtimestamp(route_data.get('time_stamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S')}*")
             
-            logger.info(f"get_train_schedule_tool output: {result_text.strip()[:200]}..." if len(result_text.strip()) > 200 else f"get_train_schedule_tool output: {result_text.strip()}")
-            return [TextContent(type="text", text=result_text.strip())]
+            result_text = "".join(parts).strip()
+            logger.info("get_train_schedule_tool output: %.200s%s", result_text, "..." if len(result_text) > 200 else "")
+            return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
-            logger.error(f"Error in get_train_schedule: {e}")
+            logger.error("Error in get_train_schedule: %s", e)
             raise McpError(
                 ErrorData(
                     code=INTERNAL_ERROR,
@@ -716,9 +881,9 @@ def register_railway_tools(mcp):
         station_code: Annotated[str, Field(description="Station code (e.g., NDLS, BCT, AGC)")]
     ) -> list[TextContent]:
         """Get live status of all trains currently at or arriving at a station."""
-        logger.info(f"get_station_live_status tool called with station_code={station_code}")
+        logger.info("get_station_live_status tool called with station_code=%s", station_code)
         try:
-            logger.info(f"Getting live station status for {station_code}")
+            logger.info("Getting live station status for %s", station_code)
             # Get station live status
             station_data = await RailwayAPI.get_station_live_status(station_code)
             
@@ -736,28 +901,24 @@ def register_railway_tools(mcp):
                     text=f"❌ **No live train information available for station {station_code}**"
                 )]
             
-            result_text = f"""
+            parts = [f"""
 **🚉 Live Status for Station {station_code}**
 
 **🚂 {len(trains)} trains found:**
 
-"""
+"""]
             
             for i, train in enumerate(trains, 1):
-                result_text += f"""
-**{i}. {train.get('train_name', 'N/A')} ({train.get('train_no', 'N/A')})**
-   🛤️ Route: {train.get('source_stn_name', 'N/A')} → {train.get('dstn_stn_name', 'N/A')}
-   🕐 Time: {train.get('time_at', 'N/A')}
-   📝 Status: {train.get('detail', 'N/A')}
-"""
+                parts.append(STATION_TRAIN_TMPL.format_map({**_STATION_TRAIN_DEFAULTS, **train, "i": i}))
             
-            result_text += f"\n*Last Updated: {datetime.fromtimestamp(station_data.get('time_stamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S')}*"
+            parts.append(f"\n*Last Updated: {datetime.fromtimestamp(station_data.get('time_stamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S')}*")
             
-            logger.info(f"get_station_live_status tool output: {result_text.strip()[:200]}..." if len(result_text.strip()) > 200 else f"get_station_live_status tool output: {result_text.strip()}")
-            return [TextContent(type="text", text=result_text.strip())]
+            result_text = "".join(parts).strip()
+            logger.info("get_station_live_status tool output: %.200s%s", result_text, "..." if len(result_text) > 200 else "")
+            return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
-            logger.error(f"Error in get_station_live_status: {e}")
+            logger.error("Error in get_station_live_status: %s", e)
             raise McpError(
                 ErrorData(
                     code=INTERNAL_ERROR,
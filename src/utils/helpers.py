@@ -9,9 +9,10 @@ from mcp.types import INTERNAL_ERROR
 from ..config import REQUEST_TIMEOUT, USER_AGENT
 import logging
 import httpx
-from urllib.parse import urlencode
 import re
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +94,40 @@ class ContentFetcher:
         return content
 
 
+class TTLCache:
+    """
+    Small in-memory LRU cache whose entries expire after a fixed TTL.
+    """
+    
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry when full."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._data.clear()
+
+
 def load_resume() -> str:
     """Load resume from file."""
     from ..config import RESUME_PATH
@@ -142,8 +177,11 @@ async def translate_to_english(text: str, source_lang: str = "auto") -> str:
                 "q": text,
             }
             
-            url = f"https://translate.googleapis.com/translate_a/single?{urlencode(params)}"
-            response = await client.get(url, timeout=REQUEST_TIMEOUT)
+            response = await client.get(
+                "https://translate.googleapis.com/translate_a/single",
+                params=params,
+                timeout=REQUEST_TIMEOUT
+            )
             response.raise_for_status()
             
             # Parse response and extract translated text